@@ -1,8 +1,14 @@
+import json
 import os
 from typing import List
-from pydantic_settings import BaseSettings
 
-class Settings(BaseSettings):
+import msgspec
+from dotenv import load_dotenv
+
+# Load .env once per process; variables already set in the environment take precedence
+load_dotenv(".env", override=False)
+
+class Settings(msgspec.Struct):
     # Server configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
@@ -11,7 +17,9 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
-    ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5000"]
+    ALLOWED_ORIGINS: List[str] = msgspec.field(
+        default_factory=lambda: ["http://localhost:3000", "http://localhost:5000"]
+    )
     
     # Database
     MONGODB_URI: str = "mongodb://localhost:27017/satyashield"
@@ -24,10 +32,43 @@ class Settings(BaseSettings):
     NLP_MODEL_PATH: str = f"{MODEL_BASE_PATH}/nlp"
     CV_MODEL_PATH: str = f"{MODEL_BASE_PATH}/cv"
     
+    # Face detection ("yunet" or "haar"; haar is also the fallback)
+    FACE_DETECTOR: str = "yunet"
+    YUNET_MODEL_PATH: str = f"{CV_MODEL_PATH}/face_detection_yunet_2023mar.onnx"
+    
     # Processing limits
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
     MAX_VIDEO_DURATION: int = 300  # 5 minutes
     MAX_BATCH_SIZE: int = 32
+    VIDEO_PREFETCH_FRAMES: int = 64
+    VIDEO_HW_DECODE: bool = True  # NVDEC through decord when the detector runs on CUDA
+    FRAME_DEDUP_DISTANCE: int = 6  # dHash Hamming distance below which frames are reused; 0 disables
+    
+    # Inference optimization
+    DEEPFAKE_COMPILE: bool = True
+    DEEPFAKE_WARMUP_ITERATIONS: int = 3  # dummy batches run at startup so no request pays compilation
+    DEEPFAKE_INT8: bool = False
+    DEEPFAKE_INT8_MODEL_PATH: str = f"{DEEPFAKE_MODEL_PATH}/facexray_int8.onnx"
+    DEEPFAKE_ORT_ENGINE: bool = True  # serve through ONNX Runtime / TensorRT when available
+    DEEPFAKE_ENGINE_CACHE_PATH: str = f"{DEEPFAKE_MODEL_PATH}/engine_cache"
+    # Per-channel normalization of [0, 1] pixels, given in RGB order (the detector maps it onto
+    # its BGR crops); the defaults only scale by 1/255
+    DEEPFAKE_INPUT_MEAN: List[float] = msgspec.field(default_factory=lambda: [0.0, 0.0, 0.0])
+    DEEPFAKE_INPUT_STD: List[float] = msgspec.field(default_factory=lambda: [1.0, 1.0, 1.0])
+    DEEPFAKE_CUDA_GRAPHS: bool = True  # replay captured graphs when the eager model serves CUDA
+    IMAGE_BATCH_MAX: int = 16  # image requests coalesced into one detector call
+    IMAGE_BATCH_WINDOW_MS: int = 5  # how long the coalescer waits to fill a batch
+    RESULT_TTL_HOURS: int = 24  # analysis results are dropped this long after their last update
+    MAX_RETAINED_RESULTS: int = 100000
+    DEEPFAKE_EXECUTOR_WORKERS: int = 4  # deepfake service threads running blocking detector calls
+    # Pending analyses admitted per priority; beyond its limit a submission gets 429. Separate
+    # limits keep room for critical requests while normal traffic is saturating
+    DEEPFAKE_QUEUE_LIMIT_NORMAL: int = 100
+    DEEPFAKE_QUEUE_LIMIT_HIGH: int = 50
+    DEEPFAKE_QUEUE_LIMIT_CRITICAL: int = 20
+    DEEPFAKE_QUEUE_WORKERS: int = 6
+    TORCH_INTRA_THREADS: int = 0  # 0 derives cpu_count / (WORKERS * DEEPFAKE_EXECUTOR_WORKERS)
+    TORCH_INTEROP_THREADS: int = 1
     
     # External APIs
     SEBI_API_URL: str = "https://www.sebi.gov.in/api"
@@ -49,13 +90,36 @@ class Settings(BaseSettings):
     # Monitoring
     ENABLE_METRICS: bool = True
     METRICS_PORT: int = 9090
+    PROMETHEUS_MULTIPROC_DIR: str = "/tmp/satyashield_prometheus"
     
     # Cache settings
     CACHE_TTL: int = 3600  # 1 hour
     MODEL_CACHE_SIZE: int = 10
+
+# Boolean spellings pydantic-settings accepted, so existing .env files keep loading
+_BOOL_STRINGS = {
+    **dict.fromkeys(("1", "on", "t", "true", "y", "yes"), "true"),
+    **dict.fromkeys(("0", "off", "f", "false", "n", "no"), "false"),
+}
+
+def _load_settings() -> Settings:
+    """Build settings from environment variables (case sensitive).
+    
+    List fields are JSON-encoded in the environment; booleans take the pydantic spellings
+    (yes/no, on/off, ...); other scalar values are converted from strings by msgspec.
+    """
+    values = {}
+    for field in msgspec.structs.fields(Settings):
+        raw = os.getenv(field.name)
+        if raw is None:
+            continue
+        if getattr(field.type, "__origin__", None) is list:
+            values[field.name] = json.loads(raw)
+        elif field.type is bool:
+            values[field.name] = _BOOL_STRINGS.get(raw.strip().lower(), raw)
+        else:
+            values[field.name] = raw
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    return msgspec.convert(values, Settings, strict=False)
 
-settings = Settings()
+settings = _load_settings()
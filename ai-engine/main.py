@@ -1,20 +1,55 @@
 import asyncio
 import logging
 import os
+import shutil
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
+from config.settings import settings
+
+# With several uvicorn workers each process keeps its own registry, so metrics are
+# written to a shared directory instead; this must happen before prometheus_client loads
+if settings.WORKERS > 1 and not settings.DEBUG:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Split the cores between uvicorn workers, and within a worker between the deepfake executor
+# threads that run inference concurrently, so the PyTorch/OpenCV/BLAS pools of every thread
+# together do not oversubscribe the machine. This is the single place thread counts are set;
+# OpenMP and MKL read these variables when torch is first imported
+PROCESSES = 1 if settings.DEBUG else settings.WORKERS
+THREADS_PER_WORKER = max(1, (os.cpu_count() or 1) // PROCESSES)
+THREADS_PER_CALL = settings.TORCH_INTRA_THREADS or max(
+    1, THREADS_PER_WORKER // settings.DEEPFAKE_EXECUTOR_WORKERS
+)
+os.environ.setdefault("OMP_NUM_THREADS", str(THREADS_PER_CALL))
+os.environ.setdefault("MKL_NUM_THREADS", str(THREADS_PER_CALL))
+
+import cv2
+import torch
+
+torch.set_num_threads(THREADS_PER_CALL)
+try:
+    torch.set_num_interop_threads(settings.TORCH_INTEROP_THREADS)
+except RuntimeError:
+    # Settable once per process; this module runs twice there, as __main__ (or __mp_main__
+    # in spawned workers) and again when uvicorn imports "main:app"
+    pass
+cv2.setNumThreads(THREADS_PER_CALL)
+
 import uvicorn
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
-from prometheus_client import Counter, Histogram, generate_latest
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+    multiprocess
+)
 import time
 
-from config.settings import settings
 from config.model_config import ModelConfig
-from services.deepfake_service import DeepfakeService
+from services.deepfake_service import AnalysisNotFound, DeepfakeService, ServiceOverloaded
 from services.fraud_prediction_service import FraudPredictionService
 from services.nlp_service import NLPService
 from services.computer_vision_service import ComputerVisionService
@@ -33,11 +68,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _metric(metric_type, name: str, documentation: str, labelnames=()):
+    """Create a metric, or return the registered one when main.py already ran in this process"""
+    existing = REGISTRY._names_to_collectors.get(name)
+    if existing is not None:
+        return existing
+    return metric_type(name, documentation, labelnames)
+
 # Prometheus metrics
-REQUEST_COUNT = Counter('satyashield_requests_total', 'Total requests', ['method', 'endpoint'])
-REQUEST_DURATION = Histogram('satyashield_request_duration_seconds', 'Request duration')
-PREDICTION_COUNT = Counter('satyashield_predictions_total', 'Total predictions', ['model_type'])
-MODEL_LOAD_TIME = Histogram('satyashield_model_load_seconds', 'Model loading time')
+REQUEST_COUNT = _metric(Counter, 'satyashield_requests_total', 'Total requests', ['method', 'endpoint'])
+REQUEST_DURATION = _metric(Histogram, 'satyashield_request_duration_seconds', 'Request duration')
+PREDICTION_COUNT = _metric(Counter, 'satyashield_predictions_total', 'Total predictions', ['model_type'])
+MODEL_LOAD_TIME = _metric(Histogram, 'satyashield_model_load_seconds', 'Model loading time')
+
+# Labelled REQUEST_COUNT children per (method, route template), filled in at startup
+_request_counters = {}
+
+def _register_request_counters(app: FastAPI):
+    """Precompute the labelled request counter for every route so requests skip .labels()"""
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            _request_counters[(method, route.path)] = REQUEST_COUNT.labels(
+                method=method, endpoint=route.path
+            )
 
 class AIEngine:
     def __init__(self):
@@ -49,6 +102,8 @@ class AIEngine:
         self.model_manager = None
         self.data_validator = None
         self.is_ready = False
+        self.init_error = None
+        self._init_task = None
 
     async def initialize_services(self):
         """Initialize all AI services"""
@@ -83,11 +138,30 @@ class AIEngine:
             logger.error(f"Failed to initialize AI Engine services: {e}")
             raise
 
+    def start_background_init(self):
+        """Schedule service initialization so the server can bind and answer probes meanwhile"""
+        self._init_task = asyncio.create_task(self._deferred_init())
+
+    async def _deferred_init(self):
+        """Run the heavy model loading after startup.
+        
+        A failure is recorded so the liveness probe fails too and the pod gets restarted,
+        instead of staying live but never ready.
+        """
+        try:
+            await self.initialize_services()
+        except Exception as e:
+            # Already logged by initialize_services
+            self.init_error = str(e)
+
     async def shutdown_services(self):
         """Shutdown all AI services"""
         try:
             logger.info("Shutting down AI Engine services...")
             
+            if self._init_task and not self._init_task.done():
+                self._init_task.cancel()
+            
             if self.realtime_service:
                 await self.realtime_service.stop()
             
@@ -104,11 +178,14 @@ ai_engine = AIEngine()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    await ai_engine.initialize_services()
+    # Startup: models load in the background so the port is bound immediately
+    _register_request_counters(app)
+    ai_engine.start_background_init()
     yield
     # Shutdown
     await ai_engine.shutdown_services()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
 
 # Create FastAPI app
 app = FastAPI(
@@ -134,18 +211,21 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 # Middleware for metrics
 @app.middleware("http")
 async def add_process_time_header(request, call_next):
-    start_time = time.time()
-    
-    # Count request
-    REQUEST_COUNT.labels(
-        method=request.method, 
-        endpoint=request.url.path
-    ).inc()
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
+    # Count request against the matched route template (e.g. /api/v1/fraud/{id}) rather
+    # than the raw path, so per-ID URLs do not each create a new time series
+    route = request.scope.get("route")
+    endpoint = route.path if route is not None else "__unmatched__"
+    counter = _request_counters.get((request.method, endpoint))
+    if counter is None:
+        counter = REQUEST_COUNT.labels(method=request.method, endpoint=endpoint)
+    counter.inc()
+    
     # Record duration
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     REQUEST_DURATION.observe(process_time)
     response.headers["X-Process-Time"] = str(process_time)
     
@@ -168,6 +248,18 @@ async def health_check():
         }
     }
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and model loading has not failed"""
+    if ai_engine.init_error is not None:
+        raise HTTPException(status_code=503, detail=f"AI Engine failed to initialize: {ai_engine.init_error}")
+    return {"status": "alive", "timestamp": time.time()}
+
+@app.get("/health/ready")
+async def health_readiness_check():
+    """Readiness probe: 503 until model loading has finished"""
+    return await readiness_check()
+
 @app.get("/ready")
 async def readiness_check():
     """Readiness check endpoint"""
@@ -178,7 +270,12 @@ async def readiness_check():
 @app.get("/metrics")
 async def get_metrics():
     """Prometheus metrics endpoint"""
-    return generate_latest()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Aggregate the metrics written by every worker process
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 # Dependency to get AI services
 async def get_ai_engine():
@@ -229,6 +326,33 @@ async def http_exception_handler(request, exc):
         }
     )
 
+@app.exception_handler(ServiceOverloaded)
+async def overloaded_exception_handler(request, exc):
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": "1"},
+        content={
+            "error": {
+                "code": 429,
+                "message": str(exc),
+                "timestamp": time.time()
+            }
+        }
+    )
+
+@app.exception_handler(AnalysisNotFound)
+async def not_found_exception_handler(request, exc):
+    return JSONResponse(
+        status_code=404,
+        content={
+            "error": {
+                "code": 404,
+                "message": exc.args[0],
+                "timestamp": time.time()
+            }
+        }
+    )
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
@@ -255,6 +379,11 @@ async def root():
     }
 
 if __name__ == "__main__":
+    # Drop metric files left behind by a previous run
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+        os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+    
     uvicorn.run(
         "main:app",
         host=settings.HOST,
@@ -4,11 +4,26 @@ import tensorflow as tf
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
+import copy
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import queue
+import threading
 import time
+from concurrent.futures import Future
 from dataclasses import dataclass
 
+from config.settings import settings
+
+try:
+    import decord
+except ImportError:  # optional: batched, keyframe-aware decoding
+    decord = None
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -111,56 +126,123 @@ class FaceXRayNet(nn.Module):
         
         return output, attention_weights
 
+def _load_facexray(model_path: str, device: str, dtype: Optional[torch.dtype] = None) -> FaceXRayNet:
+    """Shared FaceXRayNet for a checkpoint, or a fresh untrained one while the file is missing"""
+    try:
+        return _load_cached_facexray(model_path, device, dtype)
+    except FileNotFoundError:
+        # Not cached, so a checkpoint that appears later (download, volume mount) gets loaded
+        logger.warning(f"Model file not found at {model_path}, using untrained model")
+        return _prepare_facexray(FaceXRayNet(num_classes=2), device, dtype)
+
+@functools.lru_cache(maxsize=settings.MODEL_CACHE_SIZE)
+def _load_cached_facexray(model_path: str, device: str, dtype: Optional[torch.dtype]) -> FaceXRayNet:
+    """Load FaceXRayNet weights once per (path, device, dtype) and share them across detectors"""
+    model = FaceXRayNet(num_classes=2)
+    
+    try:
+        # mmap avoids materializing the whole checkpoint in RAM before the device copy
+        checkpoint = torch.load(model_path, map_location=device, mmap=True, weights_only=True)
+    except (RuntimeError, pickle.UnpicklingError) as e:
+        # Legacy (non-zip) checkpoints cannot be mmapped, and ones that pickle more than
+        # tensors are rejected by weights_only; load those the way they were saved
+        logger.warning(f"Falling back to a full torch.load for {model_path}: {e}")
+        checkpoint = torch.load(model_path, map_location=device, weights_only=False)
+    model.load_state_dict(checkpoint['model_state_dict'])
+    logger.info(f"Loaded deepfake model from {model_path}")
+    
+    return _prepare_facexray(model, device, dtype)
+
+def _prepare_facexray(model: FaceXRayNet, device: str, dtype: Optional[torch.dtype]) -> FaceXRayNet:
+    """Move the model to its serving device, dtype and layout, frozen in eval mode"""
+    model.to(device, dtype=dtype, memory_format=torch.channels_last)
+    # Inference only: no parameter ever needs a gradient
+    model.requires_grad_(False)
+    model.eval()
+    return model
+
+def _weights_digest(model_path: str) -> str:
+    """Content hash of a checkpoint, used to key compiled engines; 'untrained' if it is missing"""
+    if not os.path.exists(model_path):
+        return "untrained"
+    
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
 class TemporalConsistencyAnalyzer:
     """Analyzes temporal consistency across video frames"""
     
-    def __init__(self, window_size=5):
+    def __init__(self, window_size=5, use_cuda: bool = False):
         self.window_size = window_size
         self.frame_buffer = []
         
+        # Dense optical flow on the GPU when OpenCV is built with CUDA
+        self._gpu_flow = None
+        self._gpu_lock = threading.Lock()
+        if use_cuda and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+            self._gpu_flow = cv2.cuda_FarnebackOpticalFlow.create(3, 0.5, False, 15, 3, 5, 1.2, 0)
+        
+    def _compute_flows(self, grays: List[np.ndarray]) -> List[np.ndarray]:
+        """Compute dense (H, W, 2) optical flow between consecutive grayscale frames"""
+        if self._gpu_flow is None:
+            return [
+                cv2.calcOpticalFlowFarneback(grays[i-1], grays[i], None, 0.5, 3, 15, 3, 5, 1.2, 0)
+                for i in range(1, len(grays))
+            ]
+        
+        flows = []
+        with self._gpu_lock:
+            prev_gpu = cv2.cuda_GpuMat()
+            prev_gpu.upload(grays[0])
+            for gray in grays[1:]:
+                curr_gpu = cv2.cuda_GpuMat()
+                curr_gpu.upload(gray)
+                flows.append(self._gpu_flow.calc(prev_gpu, curr_gpu, None).download())
+                prev_gpu = curr_gpu
+        return flows
+        
     def analyze_consistency(self, frames: List[np.ndarray]) -> Dict:
         """Analyze temporal consistency across frames"""
         consistency_scores = []
-        optical_flows = []
-        
-        for i in range(1, len(frames)):
-            # Calculate optical flow
-            flow = cv2.calcOpticalFlowPyrLK(
-                cv2.cvtColor(frames[i-1], cv2.COLOR_BGR2GRAY),
-                cv2.cvtColor(frames[i], cv2.COLOR_BGR2GRAY),
-                None, None
-            )
-            
-            if flow[0] is not None:
-                optical_flows.append(flow)
-                
-                # Calculate consistency score based on flow patterns
-                flow_magnitude = np.sqrt(flow[0][:, :, 0]**2 + flow[0][:, :, 1]**2)
-                consistency_score = 1.0 - np.std(flow_magnitude) / np.mean(flow_magnitude)
-                consistency_scores.append(max(0, consistency_score))
         
-        avg_consistency = np.mean(consistency_scores) if consistency_scores else 0.0
+        # Convert every frame to grayscale exactly once (callers may pass grayscale already)
+        grays = [frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                 for frame in frames]
+        optical_flows = self._compute_flows(grays) if len(grays) > 1 else []
+        
+        for flow in optical_flows:
+            # Calculate consistency score based on flow patterns
+            flow_magnitude = np.hypot(flow[..., 0], flow[..., 1])
+            mean, std = cv2.meanStdDev(flow_magnitude)
+            consistency_score = 1.0 - float(std[0, 0]) / (float(mean[0, 0]) + 1e-6)
+            consistency_scores.append(max(0, consistency_score))
+        
+        scores = np.asarray(consistency_scores, dtype=np.float32)
+        avg_consistency = float(scores.mean()) if scores.size else 0.0
         
         return {
             "consistency_score": avg_consistency,
-            "anomalies": self._detect_anomalies(consistency_scores),
+            "anomalies": self._detect_anomalies(scores),
             "flow_patterns": self._analyze_flow_patterns(optical_flows)
         }
     
-    def _detect_anomalies(self, scores: List[float]) -> List[str]:
+    def _detect_anomalies(self, scores: np.ndarray) -> List[str]:
         """Detect anomalies in consistency scores"""
         anomalies = []
         
-        if not scores:
+        scores = np.asarray(scores, dtype=np.float32)
+        if not scores.size:
             return anomalies
             
-        mean_score = np.mean(scores)
-        std_score = np.std(scores)
+        mean_score = float(scores.mean())
+        std_score = float(scores.std())
         
         # Detect sudden drops in consistency
-        for i, score in enumerate(scores):
-            if score < mean_score - 2 * std_score:
-                anomalies.append(f"Sudden consistency drop at frame {i}")
+        for i in np.flatnonzero(scores < mean_score - 2 * std_score):
+            anomalies.append(f"Sudden consistency drop at frame {i}")
         
         # Detect overall low consistency
         if mean_score < 0.3:
@@ -177,18 +259,16 @@ class TemporalConsistencyAnalyzer:
         pattern_scores = []
         
         for flow in flows:
-            if flow[0] is not None:
-                # Calculate flow smoothness
-                dx = flow[0][:, :, 0]
-                dy = flow[0][:, :, 1]
-                
-                # Smoothness based on gradient
-                dx_grad = np.gradient(dx)
-                dy_grad = np.gradient(dy)
-                
-                smoothness = 1.0 / (1.0 + np.mean(np.abs(dx_grad[0]) + np.abs(dx_grad[1]) + 
-                                                 np.abs(dy_grad[0]) + np.abs(dy_grad[1])))
-                pattern_scores.append(smoothness)
+            # Smoothness based on gradient: central differences of both flow channels at once
+            # (ksize=1, scale=0.5 matches np.gradient), reduced with SIMD L1 norms
+            grad_x = cv2.Sobel(flow, cv2.CV_32F, 1, 0, ksize=1, scale=0.5)
+            grad_y = cv2.Sobel(flow, cv2.CV_32F, 0, 1, ksize=1, scale=0.5)
+            
+            mean_abs_gradient = (
+                cv2.norm(grad_x, cv2.NORM_L1) + cv2.norm(grad_y, cv2.NORM_L1)
+            ) / (flow.shape[0] * flow.shape[1])
+            smoothness = 1.0 / (1.0 + mean_abs_gradient)
+            pattern_scores.append(smoothness)
         
         avg_pattern_score = np.mean(pattern_scores) if pattern_scores else 0.0
         
@@ -200,58 +280,544 @@ class TemporalConsistencyAnalyzer:
 class DeepfakeDetector:
     """Main deepfake detection class"""
     
-    def __init__(self, model_path: str, device: str = "cpu"):
+    def __init__(self, model_path: str, device: str = "cpu",
+                 max_batch_size: int = settings.MAX_BATCH_SIZE):
         self.device = torch.device(device)
+        self.model_path = model_path
+        self.max_batch_size = max_batch_size
         self.model = None
-        self.temporal_analyzer = TemporalConsistencyAnalyzer()
-        self.face_detector = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
+        self.ort_session = None
+        self.amp_dtype = None
+        self._cuda_graphs = {}  # batch size -> (graph, static probabilities output)
+        self._inference_lock = threading.Lock()
+        self.temporal_analyzer = TemporalConsistencyAnalyzer(use_cuda=self.device.type == "cuda")
+        self._detector_lock = threading.Lock()
+        self.use_yunet = False
+        self.face_detector = self._create_face_detector()
+        
+        # Idle VideoCapture objects kept for reuse; open()/release() recycle their internal buffers.
+        # At most one is in use per executor thread calling into the detector
+        self._capture_pool = queue.LifoQueue(maxsize=settings.DEEPFAKE_EXECUTOR_WORKERS)
+        # Idle per-video crop stacks, one per executor thread; pageable, since batches are
+        # staged through the pinned slots before the H2D copy
+        self._crop_pool = queue.LifoQueue(maxsize=settings.DEEPFAKE_EXECUTOR_WORKERS)
         
         # Load model
         self._load_model(model_path)
         
+        # Input buffers reused by every batch: resized uint8 crops on the host (pinned for
+        # asynchronous copies on CUDA) and the normalized channels_last model input
+        self._host_buf = torch.empty(
+            (max_batch_size, 224, 224, 3), dtype=torch.uint8,
+            pin_memory=self.device.type == "cuda"
+        )
+        self._host_buf_np = self._host_buf.numpy()
+        self._input_buf = torch.empty(
+            (max_batch_size, 3, 224, 224), dtype=self.amp_dtype or torch.float32,
+            device=self.device
+        ).contiguous(memory_format=torch.channels_last)
+        
+        # (x / 255 - mean) / std folded into one per-channel scale and shift, kept on the device;
+        # the settings are RGB while the crops stay in OpenCV's BGR order, so reverse them
+        mean = torch.tensor(settings.DEEPFAKE_INPUT_MEAN[::-1], dtype=torch.float32).view(1, 3, 1, 1)
+        std = torch.tensor(settings.DEEPFAKE_INPUT_STD[::-1], dtype=torch.float32).view(1, 3, 1, 1)
+        self._input_scale = (1.0 / (255.0 * std)).to(self.device)
+        self._input_shift = (-mean / std).to(self.device) if mean.any() else None
+        
+        # On CUDA one dedicated thread owns the GPU. Callers stage crops into one of two
+        # pinned slots while the thread copies the other on a side stream and runs the model
+        self._infer_queue = None
+        self._infer_thread = None
+        self._infer_stop = threading.Event()
+        # Makes "not closed, so enqueue" atomic with close() setting the stop flag
+        self._submit_lock = threading.Lock()
+        if self.device.type == "cuda":
+            self._h2d_stream = torch.cuda.Stream(self.device)
+            self._infer_stream = torch.cuda.Stream(self.device)
+            self._device_u8 = torch.empty((max_batch_size, 224, 224, 3), dtype=torch.uint8,
+                                          device=self.device)
+            self._input_consumed = torch.cuda.Event()  # _device_u8 may be overwritten
+            self._staging = queue.Queue()
+            for _ in range(2):
+                slot = torch.empty((max_batch_size, 224, 224, 3), dtype=torch.uint8, pin_memory=True)
+                self._staging.put((slot, slot.numpy()))
+            # Bounded like the staging slots, so producers never run ahead of the GPU
+            self._infer_queue = queue.Queue(maxsize=2)
+            self._infer_thread = threading.Thread(
+                target=self._inference_loop, name="deepfake-inference", daemon=True
+            )
+            self._infer_thread.start()
+        
     def _load_model(self, model_path: str):
         """Load the deepfake detection model"""
         try:
-            self.model = FaceXRayNet(num_classes=2)
+            # Reduced precision on CUDA: bf16 where the GPU supports it, fp16 otherwise.
+            # Weights are cast once at load so autocast does not re-cast them every forward
+            if self.device.type == "cuda":
+                self.amp_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
             
-            # Load weights if available
-            try:
-                checkpoint = torch.load(model_path, map_location=self.device)
-                self.model.load_state_dict(checkpoint['model_state_dict'])
-                logger.info(f"Loaded deepfake model from {model_path}")
-            except FileNotFoundError:
-                logger.warning(f"Model file not found at {model_path}, using untrained model")
+            self.model = _load_facexray(model_path, str(self.device), self.amp_dtype)
+            
+            # Fuse Conv/BN/ReLU and drop eager dispatch overhead
+            if settings.DEEPFAKE_COMPILE and hasattr(torch, "compile"):
+                self.model = torch.compile(self.model, mode="reduce-overhead", fullgraph=True)
             
-            self.model.to(self.device)
-            self.model.eval()
+            # INT8 ONNX Runtime session for CPU inference
+            if settings.DEEPFAKE_INT8 and self.device.type == "cpu":
+                self.ort_session = self._load_int8_session(settings.DEEPFAKE_INT8_MODEL_PATH)
             
         except Exception as e:
             logger.error(f"Failed to load deepfake model: {e}")
             raise
     
+    def _load_int8_session(self, onnx_path: str):
+        """Load the INT8-quantized ONNX export of the model, if one has been produced"""
+        if not os.path.exists(onnx_path):
+            logger.warning(f"INT8 model not found at {onnx_path}, using PyTorch model")
+            return None
+        
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(onnx_path, sess_options=options,
+                                       providers=["CPUExecutionProvider"])
+        logger.info(f"Loaded INT8 deepfake model from {onnx_path}")
+        return session
+    
+    def load_ort_engine(self, cache_dir: str = settings.DEEPFAKE_ENGINE_CACHE_PATH) -> bool:
+        """Serve the model through ONNX Runtime, preferring TensorRT, then CUDA, then CPU.
+        
+        The ONNX export and TensorRT engines are cached in ``cache_dir`` keyed by the
+        checkpoint hash, so they are built once per set of weights. Returns False and
+        keeps the PyTorch model when no suitable execution provider is available.
+        """
+        import onnxruntime as ort
+        
+        available = ort.get_available_providers()
+        if self.device.type == "cuda":
+            providers = [
+                ("TensorrtExecutionProvider", {
+                    "device_id": self.device.index or 0,
+                    "trt_fp16_enable": True,
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": cache_dir
+                }),
+                ("CUDAExecutionProvider", {"device_id": self.device.index or 0})
+            ]
+            providers = [p for p in providers if p[0] in available]
+            if not providers:
+                logger.warning("No GPU execution provider in onnxruntime, keeping PyTorch model")
+                return False
+        else:
+            providers = ["CPUExecutionProvider"]
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        onnx_path = os.path.join(cache_dir, f"facexray_{_weights_digest(self.model_path)}.onnx")
+        if not os.path.exists(onnx_path):
+            # Export beside the target and rename, so workers exporting at the same time
+            # never load each other's half-written file
+            tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+            try:
+                self.export_onnx(tmp_path)
+                os.replace(tmp_path, onnx_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            logger.info(f"Exported deepfake model to {onnx_path}")
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.ort_session = ort.InferenceSession(onnx_path, sess_options=options, providers=providers)
+        logger.info(f"Deepfake model served by ONNX Runtime ({self.ort_session.get_providers()[0]})")
+        return True
+    
+    @torch.inference_mode()
+    def warmup(self, iterations: int = settings.DEEPFAKE_WARMUP_ITERATIONS):
+        """Run dummy batches through the serving path before the first request.
+        
+        torch.compile, TensorRT engine builds and cuDNN autotuning all happen on first use;
+        both a single face and a full batch are run so either shape is ready. If compilation
+        fails the model falls back to eager mode instead of failing every request.
+        """
+        dummy = np.zeros((self.max_batch_size, 224, 224, 3), dtype=np.uint8)
+        
+        try:
+            for _ in range(iterations):
+                self.classify_faces(dummy[:1])
+                self.classify_faces(dummy)
+        except Exception as e:
+            if not hasattr(self.model, "_orig_mod"):
+                raise
+            logger.warning(f"torch.compile failed during warmup, using the eager model: {e}")
+            self.model = self.model._orig_mod
+            self.classify_faces(dummy)
+    
+    def capture_cuda_graphs(self) -> bool:
+        """Capture the eager CUDA forward as CUDA graphs for power-of-two batch sizes.
+        
+        A replay launches the whole forward at once, removing the per-kernel launch cost
+        that dominates small image batches. Batches are padded up to the next captured
+        size. Skipped when torch.compile (whose reduce-overhead mode already uses CUDA
+        graphs) or an ONNX Runtime session serves the model.
+        """
+        if (self.device.type != "cuda" or self.ort_session is not None or
+                hasattr(self.model, "_orig_mod")):
+            return False
+        
+        sizes = [1 << i for i in range(self.max_batch_size.bit_length()) if 1 << i < self.max_batch_size]
+        sizes.append(self.max_batch_size)
+        
+        graphs = {}
+        pool = None
+        with self._inference_lock, torch.inference_mode(), torch.autocast(
+            device_type="cuda", dtype=self.amp_dtype, enabled=self.amp_dtype is not None
+        ):
+            self._input_buf.zero_()
+            
+            # Warm up on a side stream so lazy initialization is not captured
+            side_stream = torch.cuda.Stream(self.device)
+            side_stream.wait_stream(torch.cuda.current_stream(self.device))
+            with torch.cuda.stream(side_stream):
+                for _ in range(3):
+                    self.model(self._input_buf)
+            torch.cuda.current_stream(self.device).wait_stream(side_stream)
+            
+            # Largest first, so the smaller graphs fit in its memory pool
+            for size in reversed(sizes):
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph, pool=pool):
+                    output, _ = self.model(self._input_buf[:size])
+                    deepfake_probs = F.softmax(output.float(), dim=1)[:, 1]
+                pool = graph.pool()
+                graphs[size] = (graph, deepfake_probs)
+        
+        self._cuda_graphs = graphs
+        logger.info(f"Captured CUDA graphs for batch sizes {sizes}")
+        return True
+    
+    def export_onnx(self, onnx_path: str):
+        """Export the model to ONNX with a dynamic batch dimension"""
+        model = getattr(self.model, "_orig_mod", self.model)  # unwrap torch.compile
+        if next(model.parameters()).dtype != torch.float32:
+            # Export an FP32 graph; ONNX Runtime / TensorRT choose their own precision
+            model = copy.deepcopy(model).float()
+        dummy_input = torch.zeros((1, 3, 224, 224), device=self.device)
+        torch.onnx.export(
+            model, dummy_input, onnx_path, opset_version=17,
+            input_names=["input"], output_names=["logits", "attention"],
+            dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}, "attention": {0: "batch"}}
+        )
+    
+    def export_int8(self, calibration_faces: List[np.ndarray],
+                    onnx_path: str = settings.DEEPFAKE_INT8_MODEL_PATH):
+        """Export the model to ONNX and statically quantize it to INT8.
+        
+        A few hundred representative face crops are used to calibrate activation ranges.
+        """
+        from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+        
+        fp32_path = onnx_path.replace(".onnx", "_fp32.onnx")
+        self.export_onnx(fp32_path)
+        
+        calibration_inputs = [
+            np.ascontiguousarray(self.preprocess_frame(face).float().cpu().numpy())
+            for face in calibration_faces
+        ]
+        
+        class FaceCalibrationReader(CalibrationDataReader):
+            def __init__(self):
+                self._inputs = iter(calibration_inputs)
+            
+            def get_next(self):
+                batch = next(self._inputs, None)
+                return None if batch is None else {"input": batch}
+        
+        quantize_static(
+            fp32_path, onnx_path, FaceCalibrationReader(),
+            quant_format=QuantFormat.QOperator, per_channel=True,
+            activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8
+        )
+        logger.info(f"Exported INT8 deepfake model to {onnx_path}")
+    
+    def _create_face_detector(self):
+        """Create the face detector, falling back to the Haar cascade if YuNet is unavailable"""
+        if settings.FACE_DETECTOR == "yunet" and hasattr(cv2, "FaceDetectorYN"):
+            try:
+                detector = cv2.FaceDetectorYN.create(
+                    settings.YUNET_MODEL_PATH, "", (320, 320), score_threshold=0.9
+                )
+                self.use_yunet = True
+                logger.info(f"Loaded YuNet face detector from {settings.YUNET_MODEL_PATH}")
+                return detector
+            except cv2.error as e:
+                logger.warning(f"YuNet face detector unavailable, using Haar cascade: {e}")
+        
+        return cv2.CascadeClassifier(
+            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        )
+    
     def preprocess_frame(self, frame: np.ndarray) -> torch.Tensor:
         """Preprocess a single frame for model input"""
-        # Resize to model input size
-        frame_resized = cv2.resize(frame, (224, 224))
+        with self._inference_lock:
+            frame_input = self._preprocess_batch([frame]).clone()
+            if self.device.type == "cuda":
+                # The H2D copy and the clone are only queued; finish them before the GPU
+                # thread or the next caller reuses _host_buf and _input_buf
+                torch.cuda.current_stream(self.device).synchronize()
+            return frame_input
+    
+    @staticmethod
+    def _resize_face(face: np.ndarray, dst: np.ndarray):
+        """Resize a face crop into a (224, 224, 3) uint8 slot; INTER_AREA for downscaled crops"""
+        cv2.resize(face, (224, 224), dst=dst, interpolation=cv2.INTER_AREA)
+    
+    def _preprocess_batch(self, faces) -> torch.Tensor:
+        """Preprocess up to max_batch_size face crops into the shared input buffer.
+        
+        ``faces`` is either a list of raw crops or an already resized (N, 224, 224, 3)
+        uint8 stack. Must be called with the inference lock held; the returned tensor
+        is a view of the buffer and is overwritten by the next batch.
+        """
+        # Batches queued asynchronously by the GPU thread may still be reading the input buffer
+        if self._infer_queue is not None:
+            self._infer_stream.synchronize()
         
-        # Normalize
-        frame_normalized = frame_resized.astype(np.float32) / 255.0
+        # Fill the preallocated (N, 224, 224, 3) host buffer
+        if isinstance(faces, np.ndarray):
+            np.copyto(self._host_buf_np[:len(faces)], faces)
+        else:
+            for i, face in enumerate(faces):
+                self._resize_face(face, self._host_buf_np[i])
         
-        # Convert to tensor
-        frame_tensor = torch.from_numpy(frame_normalized).permute(2, 0, 1).unsqueeze(0)
+        return self._to_input(self._host_buf[:len(faces)])
+    
+    def _to_input(self, crops: torch.Tensor) -> torch.Tensor:
+        """Convert (N, 224, 224, 3) uint8 crops into the normalized model input buffer"""
+        batch = self._input_buf[:len(crops)]
+        if crops.device != batch.device:
+            crops = crops.to(batch.device, non_blocking=True)
+        
+        # NHWC viewed as NCHW is channels_last, so the uint8 -> float conversion and scaling
+        # run as a single elementwise kernel writing straight into the input buffer
+        torch.mul(crops.permute(0, 3, 1, 2), self._input_scale, out=batch)
+        if self._input_shift is not None:
+            batch.add_(self._input_shift)
+        return batch
+    
+    def classify_faces(self, faces) -> np.ndarray:
+        """Run batched inference over face crops and return their deepfake probabilities.
+        
+        Accepts a list of raw crops or a pre-resized (N, 224, 224, 3) uint8 stack.
+        """
+        probabilities = np.empty(len(faces), dtype=np.float32)
+        
+        if self._infer_queue is not None:
+            # Stage every chunk first so the next one is copied while the GPU runs the previous
+            futures = [
+                (start, self._submit_batch(faces[start:start + self.max_batch_size]))
+                for start in range(0, len(faces), self.max_batch_size)
+            ]
+            for start, future in futures:
+                result = future.result()
+                probabilities[start:start + len(result)] = result
+            return probabilities
+        
+        # The input buffers are shared, so batches from concurrent callers are serialized
+        with self._inference_lock:
+            for start in range(0, len(faces), self.max_batch_size):
+                batch = self._preprocess_batch(faces[start:start + self.max_batch_size])
+                probabilities[start:start + len(batch)] = self._forward(batch)
+        
+        return probabilities
+    
+    def _submit_batch(self, faces, on_device: bool = False) -> Future:
+        """Stage up to max_batch_size crops into a pinned slot and queue them for the GPU thread.
+        
+        With ``on_device`` the future resolves as soon as the batch is queued on the GPU, to
+        a device tensor of probabilities; collect those with _gather_probabilities.
+        """
+        if self._infer_stop.is_set():
+            raise RuntimeError("Deepfake detector has been closed")
+        
+        slot, slot_np = self._staging.get()
+        
+        if isinstance(faces, np.ndarray):
+            np.copyto(slot_np[:len(faces)], faces)
+        else:
+            for i, face in enumerate(faces):
+                self._resize_face(face, slot_np[i])
+        
+        future = Future()
+        with self._submit_lock:
+            if self._infer_stop.is_set():
+                self._staging.put((slot, slot_np))
+                raise RuntimeError("Deepfake detector has been closed")
+            self._infer_queue.put((slot, slot_np, len(faces), on_device, future))
+        return future
+    
+    def _inference_loop(self):
+        """Run queued batches: H2D copy on a side stream, normalization and forward on another"""
+        # Grad mode is thread-local, so disable autograd for this thread's whole lifetime
+        torch.set_grad_enabled(False)
+        
+        # Runs until close() sends the sentinel, so batches queued before it still complete
+        while True:
+            item = self._infer_queue.get()
+            if item is None:
+                break
+            
+            slot, slot_np, count, on_device, future = item
+            copied = torch.cuda.Event()
+            try:
+                with self._inference_lock:
+                    # Do not overwrite _device_u8 before the previous batch has been normalized
+                    self._h2d_stream.wait_event(self._input_consumed)
+                    with torch.cuda.stream(self._h2d_stream):
+                        self._device_u8[:count].copy_(slot[:count], non_blocking=True)
+                        copied.record()
+                    
+                    self._infer_stream.wait_stream(self._h2d_stream)
+                    with torch.cuda.stream(self._infer_stream):
+                        batch = self._to_input(self._device_u8[:count])
+                        self._input_consumed.record()
+                        
+                        if on_device and self.ort_session is None:
+                            future.set_result(self._forward_probs(batch))
+                        else:
+                            future.set_result(self._forward(batch))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                # The pinned slot is free once its copy has landed on the device
+                copied.synchronize()
+                self._staging.put((slot, slot_np))
+    
+    def close(self, timeout: float = 10.0):
+        """Stop the GPU inference thread once the batches already queued have run"""
+        if self._infer_thread is None or self._infer_stop.is_set():
+            return
+        
+        # Once the flag is set under the lock no batch can be queued behind the sentinel
+        with self._submit_lock:
+            self._infer_stop.set()
+        self._infer_queue.put(None)
+        self._infer_thread.join(timeout)
+        
+        # Fail whatever the thread did not get to (only possible if the join timed out)
+        while True:
+            try:
+                item = self._infer_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                slot, slot_np, _, _, future = item
+                future.set_exception(RuntimeError("detector closed"))
+                self._staging.put((slot, slot_np))
+    
+    def _gather_probabilities(self, parts: List) -> np.ndarray:
+        """Concatenate per-batch probabilities, copying device results to the host once"""
+        if not parts:
+            return np.empty(0, dtype=np.float32)
+        
+        if not any(torch.is_tensor(part) for part in parts):
+            return np.concatenate(parts)
+        
+        # Device results were produced on the inference stream
+        torch.cuda.current_stream(self.device).wait_stream(self._infer_stream)
+        return torch.cat([
+            part if torch.is_tensor(part) else torch.from_numpy(part).to(self.device)
+            for part in parts
+        ]).cpu().numpy()
+    
+    def _forward(self, batch: torch.Tensor) -> np.ndarray:
+        """Run one preprocessed batch through the model and return deepfake probabilities"""
+        if self.ort_session is not None:
+            logits = self._run_ort(batch)
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            return exp[:, 1] / exp.sum(axis=1)
+        
+        return self._forward_probs(batch).cpu().numpy()
+    
+    def _forward_probs(self, batch: torch.Tensor) -> torch.Tensor:
+        """Run one preprocessed batch through the PyTorch model, leaving probabilities on the device"""
+        if self._cuda_graphs:
+            # batch is a view of _input_buf, which every graph reads from; the static output
+            # is overwritten by the next replay, so hand out a copy
+            graph, deepfake_probs = self._cuda_graphs[
+                min(size for size in self._cuda_graphs if size >= len(batch))
+            ]
+            graph.replay()
+            return deepfake_probs[:len(batch)].clone()
         
-        return frame_tensor.to(self.device)
+        with torch.inference_mode(), torch.autocast(
+            device_type=self.device.type, dtype=self.amp_dtype, enabled=self.amp_dtype is not None
+        ):
+            output, _ = self.model(batch)
+            return F.softmax(output.float(), dim=1)[:, 1]
     
-    def detect_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        """Detect faces in frame"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def _run_ort(self, batch: torch.Tensor) -> np.ndarray:
+        """Run a batch through the ONNX Runtime session and return the logits"""
+        # The exported graph takes contiguous FP32 NCHW input
+        batch = batch.float().contiguous()
+        
+        if self.device.type != "cuda":
+            return self.ort_session.run(["logits"], {"input": batch.numpy()})[0]
+        
+        # Bind the device tensor directly so the input never round-trips through the host;
+        # ORT runs on its own stream, so wait for the preprocessing kernels first
+        torch.cuda.current_stream(self.device).synchronize()
+        binding = self.ort_session.io_binding()
+        binding.bind_input("input", "cuda", self.device.index or 0, np.float32,
+                           tuple(batch.shape), batch.data_ptr())
+        binding.bind_output("logits")
+        self.ort_session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()[0]
+    
+    def detect_faces(self, frame: np.ndarray,
+                     gray: Optional[np.ndarray] = None) -> List[Tuple[int, int, int, int]]:
+        """Detect faces in frame; pass its grayscale version if already computed"""
+        if self.use_yunet:
+            height, width = frame.shape[:2]
+            
+            # YuNet keeps per-input-size state, so calls are serialized
+            with self._detector_lock:
+                self.face_detector.setInputSize((width, height))
+                _, detections = self.face_detector.detect(frame)
+            
+            if detections is None:
+                return []
+            
+            # Clip both corners to the frame so boxes hanging off any edge stay in bounds
+            x, y, w, h = detections[:, :4].astype(np.int32).T
+            x1, y1 = np.maximum(x, 0), np.maximum(y, 0)
+            x2, y2 = np.minimum(x + w, width), np.minimum(y + h, height)
+            boxes = np.stack([x1, y1, x2 - x1, y2 - y1], axis=1)
+            return boxes[(x2 > x1) & (y2 > y1)]
+        
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         faces = self.face_detector.detectMultiScale(
             gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
         )
         return faces
     
+    def _aggregate_faces(self, result: Dict, face_results: List[Dict]) -> Dict:
+        """Fill frame-level fields of a result from its per-face results"""
+        if not face_results:
+            result.update({"has_faces": False, "is_deepfake": False, "confidence": 0.0})
+            return result
+        
+        avg_confidence = float(np.mean([r["confidence"] for r in face_results]))
+        result.update({
+            "has_faces": True,
+            "is_deepfake": avg_confidence > 0.5,
+            "confidence": avg_confidence,
+            "faces": face_results
+        })
+        return result
+    
+    @torch.inference_mode()
     def analyze_frame(self, frame: np.ndarray) -> Dict:
         """Analyze a single frame for deepfake indicators"""
         start_time = time.time()
@@ -260,49 +826,22 @@ class DeepfakeDetector:
             # Detect faces
             faces = self.detect_faces(frame)
             
-            if len(faces) == 0:
-                return {
-                    "has_faces": False,
-                    "is_deepfake": False,
-                    "confidence": 0.0,
-                    "processing_time": time.time() - start_time
-                }
-            
-            frame_results = []
+            # Classify all faces of the frame in a single forward pass
+            crops = [frame[y:y+h, x:x+w] for (x, y, w, h) in faces]
+            probabilities = self.classify_faces(crops) if crops else []
             
-            for (x, y, w, h) in faces:
-                # Extract face region
-                face_region = frame[y:y+h, x:x+w]
-                
-                # Preprocess
-                face_tensor = self.preprocess_frame(face_region)
-                
-                # Model inference
-                with torch.no_grad():
-                    output, attention = self.model(face_tensor)
-                    probabilities = F.softmax(output, dim=1)
-                    
-                    deepfake_prob = probabilities[0][1].item()
-                    is_deepfake = deepfake_prob > 0.5
-                    
-                frame_results.append({
-                    "bbox": (x, y, w, h),
-                    "is_deepfake": is_deepfake,
-                    "confidence": deepfake_prob,
-                    "attention_map": attention.cpu().numpy() if attention is not None else None
-                })
-            
-            # Aggregate results
-            avg_confidence = np.mean([r["confidence"] for r in frame_results])
-            is_deepfake = avg_confidence > 0.5
+            face_results = [
+                {
+                    "bbox": (int(x), int(y), int(w), int(h)),
+                    "is_deepfake": bool(prob > 0.5),
+                    "confidence": float(prob)
+                }
+                for (x, y, w, h), prob in zip(faces, probabilities)
+            ]
             
-            return {
-                "has_faces": True,
-                "is_deepfake": is_deepfake,
-                "confidence": avg_confidence,
-                "faces": frame_results,
-                "processing_time": time.time() - start_time
-            }
+            result = self._aggregate_faces({}, face_results)
+            result["processing_time"] = time.time() - start_time
+            return result
             
         except Exception as e:
             logger.error(f"Error analyzing frame: {e}")
@@ -314,42 +853,255 @@ class DeepfakeDetector:
                 "processing_time": time.time() - start_time
             }
     
+    def _acquire_capture(self, video_path: str) -> cv2.VideoCapture:
+        """Open a video with a pooled VideoCapture, creating one if the pool is empty"""
+        try:
+            cap = self._capture_pool.get_nowait()
+        except queue.Empty:
+            cap = cv2.VideoCapture()
+        cap.open(video_path)
+        return cap
+    
+    def _release_capture(self, cap: cv2.VideoCapture):
+        """Close a capture and return it to the pool"""
+        cap.release()
+        try:
+            self._capture_pool.put_nowait(cap)
+        except queue.Full:
+            pass
+    
+    def _acquire_crops(self) -> np.ndarray:
+        """Check out a (max_batch_size, 224, 224, 3) uint8 crop stack, allocating if none is idle"""
+        try:
+            return self._crop_pool.get_nowait()
+        except queue.Empty:
+            return np.empty((self.max_batch_size, 224, 224, 3), dtype=np.uint8)
+    
+    def _release_crops(self, crops: np.ndarray):
+        """Return a crop stack to the pool"""
+        try:
+            self._crop_pool.put_nowait(crops)
+        except queue.Full:
+            pass
+    
+    def _read_capture(self, cap: cv2.VideoCapture, sample_rate: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield sampled frames from an OpenCV capture.
+        
+        Skipped frames are only grabbed, never retrieved, so they skip the colour
+        conversion and copy into a BGR array.
+        """
+        try:
+            frame_idx = 0
+            while cap.grab():
+                if frame_idx % sample_rate == 0:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    yield frame_idx, frame
+                frame_idx += 1
+        finally:
+            self._release_capture(cap)
+    
+    def _open_decord(self, video_path: str):
+        """Open a decord reader, decoding on NVDEC when running on CUDA and decord supports it"""
+        if settings.VIDEO_HW_DECODE and self.device.type == "cuda":
+            try:
+                return decord.VideoReader(video_path, ctx=decord.gpu(self.device.index or 0))
+            except decord.DECORDError as e:
+                # CPU-only decord builds reject GPU contexts
+                logger.debug(f"Hardware decoding unavailable, decoding on CPU: {e}")
+        
+        return decord.VideoReader(video_path, num_threads=2)
+    
+    def _read_decord(self, reader, sample_rate: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield sampled frames from a decord VideoReader, decoding only the sampled indices"""
+        indices = list(range(0, len(reader), sample_rate))
+        for start in range(0, len(indices), self.max_batch_size):
+            chunk = indices[start:start + self.max_batch_size]
+            for frame_idx, rgb in zip(chunk, reader.get_batch(chunk).asnumpy()):
+                yield frame_idx, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    
+    def _decode_frames(self, frames: Iterator[Tuple[int, np.ndarray]]) -> Iterator[Tuple[int, np.ndarray]]:
+        """Run a frame reader on a background thread, yielding through a bounded queue"""
+        frame_queue = queue.Queue(maxsize=settings.VIDEO_PREFETCH_FRAMES)
+        stop = threading.Event()
+        end_of_stream = object()
+        
+        def reader():
+            try:
+                for item in frames:
+                    if stop.is_set():
+                        break
+                    frame_queue.put(item)
+            except Exception as e:
+                frame_queue.put(e)
+            finally:
+                frames.close()
+                frame_queue.put(end_of_stream)
+        
+        thread = threading.Thread(target=reader, name="video-decoder", daemon=True)
+        thread.start()
+        
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is end_of_stream:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Unblock the reader if the consumer stopped early
+            stop.set()
+            while thread.is_alive():
+                try:
+                    frame_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+    
+    @staticmethod
+    def _frame_hash(gray: np.ndarray) -> int:
+        """64-bit difference hash (dHash) of a grayscale frame for cheap near-duplicate detection"""
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+    
+    def _classify_pending(self, pending: List[Tuple[int, Tuple[int, int, int, int]]],
+                          crops: np.ndarray, scored: List[Tuple[List, Future]]):
+        """Classify queued face crops as one batch, recording the faces and their future scores.
+        
+        On CUDA the scores stay on the device until _collect_scores gathers every batch at once.
+        """
+        if not pending:
+            return
+        
+        if self._infer_queue is not None:
+            future = self._submit_batch(crops[:len(pending)], on_device=True)
+        else:
+            future = Future()
+            future.set_result(self.classify_faces(crops[:len(pending)]))
+        
+        scored.append((list(pending), future))
+        pending.clear()
+    
+    def _collect_scores(self, scored: List[Tuple[List, Future]], faces_per_frame: List[List[Dict]]):
+        """Copy all batch scores to the host in one transfer and attach them to their frames"""
+        probabilities = self._gather_probabilities([future.result() for _, future in scored])
+        faces = [face for batch_faces, _ in scored for face in batch_faces]
+        
+        for (result_idx, bbox), prob in zip(faces, probabilities.tolist()):
+            faces_per_frame[result_idx].append({
+                "bbox": bbox,
+                "is_deepfake": prob > 0.5,
+                "confidence": prob
+            })
+    
+    def explain_frame(self, frame: np.ndarray) -> List[Dict]:
+        """Return per-face attention maps for explainability.
+        
+        Attention is never copied off the device on the analysis path; it is only
+        transferred here, when explicitly requested.
+        """
+        faces = self.detect_faces(frame)
+        crops = [frame[y:y+h, x:x+w] for (x, y, w, h) in faces]
+        explanations = []
+        
+        with self._inference_lock:
+            for start in range(0, len(crops), self.max_batch_size):
+                batch = self._preprocess_batch(crops[start:start + self.max_batch_size])
+                
+                with torch.inference_mode(), torch.autocast(
+                    device_type=self.device.type, dtype=self.amp_dtype, enabled=self.amp_dtype is not None
+                ):
+                    output, attention = self.model(batch)
+                    deepfake_probs = F.softmax(output.float(), dim=1)[:, 1].cpu().numpy()
+                    attention_maps = attention.float().squeeze(1).cpu().numpy()
+                
+                for (x, y, w, h), prob, attention_map in zip(
+                    faces[start:start + self.max_batch_size], deepfake_probs, attention_maps
+                ):
+                    explanations.append({
+                        "bbox": (int(x), int(y), int(w), int(h)),
+                        "confidence": float(prob),
+                        "attention_map": attention_map.tolist()
+                    })
+        
+        return explanations
+    
+    @torch.inference_mode()
     def analyze_video(self, video_path: str, sample_rate: int = 5) -> DeepfakeResult:
         """Analyze a video for deepfake content"""
         start_time = time.time()
+        crops = None
         
         try:
-            cap = cv2.VideoCapture(video_path)
-            
-            if not cap.isOpened():
-                raise ValueError(f"Could not open video file: {video_path}")
-            
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
+            if decord is not None:
+                video_reader = self._open_decord(video_path)
+                fps = video_reader.get_avg_fps()
+                sampled_frames = self._read_decord(video_reader, sample_rate)
+            else:
+                cap = self._acquire_capture(video_path)
+                
+                if not cap.isOpened():
+                    self._release_capture(cap)
+                    raise ValueError(f"Could not open video file: {video_path}")
+                
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                sampled_frames = self._read_capture(cap, sample_rate)
             
-            frames = []
+            grays = []
             frame_results = []
-            frame_idx = 0
+            faces_per_frame = []
+            pending = []  # (frame index in frame_results, bbox) awaiting inference
+            scored = []  # (faces, future probabilities) per submitted batch
+            # Crops are resized into this contiguous stack as they are detected, so decoded
+            # frames are not kept alive until the batch runs
+            crops = self._acquire_crops()
+            duplicate_of = {}  # frame index -> index of the near-identical frame it reuses
+            last_hash = None
+            last_processed = None
             
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+            # Frames are decoded on a background thread while faces are detected here
+            for frame_idx, frame in self._decode_frames(sampled_frames):
+                frame_start = time.time()
                 
-                # Sample frames at specified rate
-                if frame_idx % sample_rate == 0:
-                    frames.append(frame)
-                    result = self.analyze_frame(frame)
-                    result["frame_number"] = frame_idx
-                    result["timestamp"] = frame_idx / fps
-                    frame_results.append(result)
+                # One grayscale conversion per frame, shared by hashing, the Haar detector and
+                # temporal analysis; only the grayscale copy is kept past this iteration
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                grays.append(gray)
+                result = {"frame_number": frame_idx, "timestamp": frame_idx / fps}
+                faces_per_frame.append([])
                 
-                frame_idx += 1
+                # Near-static scenes: reuse the last processed frame instead of re-running the model
+                frame_hash = self._frame_hash(gray)
+                if (last_hash is not None and
+                        bin(frame_hash ^ last_hash).count("1") < settings.FRAME_DEDUP_DISTANCE):
+                    duplicate_of[len(frame_results)] = last_processed
+                    result["duplicate_of"] = frame_results[last_processed]["frame_number"]
+                else:
+                    last_hash = frame_hash
+                    last_processed = len(frame_results)
+                    for (x, y, w, h) in self.detect_faces(frame, gray):
+                        # Run a batch as soon as it is full so inference overlaps decoding
+                        if len(pending) == self.max_batch_size:
+                            self._classify_pending(pending, crops, scored)
+                        self._resize_face(frame[y:y+h, x:x+w], crops[len(pending)])
+                        pending.append((len(frame_results), (int(x), int(y), int(w), int(h))))
+                
+                result["processing_time"] = time.time() - frame_start
+                frame_results.append(result)
+            
+            self._classify_pending(pending, crops, scored)
+            self._collect_scores(scored, faces_per_frame)
+            
+            for frame_index, source_index in duplicate_of.items():
+                faces_per_frame[frame_index] = list(faces_per_frame[source_index])
             
-            cap.release()
+            for result, face_results in zip(frame_results, faces_per_frame):
+                self._aggregate_faces(result, face_results)
             
             # Temporal consistency analysis
-            temporal_analysis = self.temporal_analyzer.analyze_consistency(frames)
+            temporal_analysis = self.temporal_analyzer.analyze_consistency(grays)
             
             # Aggregate results
             valid_results = [r for r in frame_results if r["has_faces"]]
@@ -364,8 +1116,8 @@ class DeepfakeDetector:
                 )
             
             # Calculate overall confidence
-            confidences = [r["confidence"] for r in valid_results]
-            overall_confidence = np.mean(confidences)
+            confidences = np.asarray([r["confidence"] for r in valid_results], dtype=np.float32)
+            overall_confidence = float(confidences.mean())
             
             # Weight temporal consistency
             temporal_weight = 0.3
@@ -382,7 +1134,7 @@ class DeepfakeDetector:
             anomalies.extend(temporal_analysis["flow_patterns"]["anomalies"])
             
             # Check for statistical anomalies
-            if np.std(confidences) > 0.3:
+            if confidences.std() > 0.3:
                 anomalies.append("High variance in frame-level confidence scores")
             
             if overall_confidence > 0.7 and temporal_analysis["consistency_score"] < 0.3:
@@ -405,7 +1157,12 @@ class DeepfakeDetector:
                 processing_time=time.time() - start_time,
                 anomalies=[f"Analysis failed: {str(e)}"]
             )
+        
+        finally:
+            if crops is not None:
+                self._release_crops(crops)
     
+    @torch.inference_mode()
     def analyze_image(self, image_path: str) -> DeepfakeResult:
         """Analyze a single image for deepfake content"""
         start_time = time.time()
@@ -434,6 +1191,69 @@ class DeepfakeDetector:
                 processing_time=time.time() - start_time,
                 anomalies=[f"Analysis failed: {str(e)}"]
             )
+    
+    @torch.inference_mode()
+    def analyze_images(self, image_paths: List[str]) -> List[DeepfakeResult]:
+        """Analyze several images, classifying the faces of all of them in shared batches"""
+        start_time = time.time()
+        results = [None] * len(image_paths)
+        face_boxes = []  # per image: detected bboxes, or None if the image failed
+        crops = []
+        
+        for i, image_path in enumerate(image_paths):
+            try:
+                image = cv2.imread(image_path)
+                if image is None:
+                    raise ValueError(f"Could not load image: {image_path}")
+                
+                faces = self.detect_faces(image)
+                # Resize crops now so the decoded images can be dropped before inference
+                for (x, y, w, h) in faces:
+                    crop = np.empty((224, 224, 3), dtype=np.uint8)
+                    self._resize_face(image[y:y+h, x:x+w], crop)
+                    crops.append(crop)
+                face_boxes.append(faces)
+                
+            except Exception as e:
+                logger.error(f"Error analyzing image: {e}")
+                face_boxes.append(None)
+                results[i] = DeepfakeResult(
+                    is_deepfake=False,
+                    confidence=0.0,
+                    frame_level_results=[],
+                    processing_time=time.time() - start_time,
+                    anomalies=[f"Analysis failed: {str(e)}"]
+                )
+        
+        probabilities = self.classify_faces(np.stack(crops)) if crops else []
+        
+        offset = 0
+        for i, faces in enumerate(face_boxes):
+            if faces is None:
+                continue
+            
+            face_results = [
+                {
+                    "bbox": (int(x), int(y), int(w), int(h)),
+                    "is_deepfake": bool(prob > 0.5),
+                    "confidence": float(prob)
+                }
+                for (x, y, w, h), prob in zip(faces, probabilities[offset:offset + len(faces)])
+            ]
+            offset += len(faces)
+            
+            result = self._aggregate_faces({}, face_results)
+            result["processing_time"] = time.time() - start_time
+            results[i] = DeepfakeResult(
+                is_deepfake=result["is_deepfake"],
+                confidence=result["confidence"],
+                frame_level_results=[result],
+                processing_time=time.time() - start_time,
+                anomalies=[] if result["has_faces"] else ["No faces detected in image"]
+            )
+        
+        return results
+
 
 class AudioDeepfakeDetector:
     """Audio deepfake detection component"""
@@ -3,6 +3,7 @@ import pandas as pd
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torch.utils.data import DataLoader, TensorDataset
 from sklearn.ensemble import IsolationForest, RandomForestClassifier
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from transformers import AutoTokenizer, AutoModel
@@ -11,10 +12,39 @@ import logging
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import re
+import os
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+TEXT_EMBEDDING_DIM = 768  # BERT base embedding size
+EMBEDDING_CACHE_SIZE = 10000  # identical posts are common across social data
+PREDICTION_CACHE_SIZE = 10000
+PREDICTION_CACHE_TTL = 3600  # seconds; bounds staleness of date-relative advisor features
+PREDICTION_CACHE_MAX_BYTES = 64 * 1024  # larger payloads are not worth hashing
+MIN_EMBEDDING_WORDS = 5  # shorter texts carry too little context to be worth a BERT forward
+
 @dataclass
 class FraudPredictionResult:
     is_fraud: bool
@@ -25,9 +55,67 @@ class FraudPredictionResult:
     model_predictions: Dict[str, float]
     explanation: str
 
+def _financial_kernel(promised_returns, min_investment, lock_in_days, fee_transparency):
+    """Column-wise extract_financial_features; returns an (N, 4) float32 array"""
+    n = promised_returns.shape[0]
+    out = np.empty((n, 4), dtype=np.float32)
+    for i in range(n):
+        out[i, 0] = min(max(promised_returns[i] - 15.0, 0.0) / 50.0, 1.0)
+        out[i, 1] = 1.0 if min_investment[i] > 100000 else min_investment[i] / 100000
+        out[i, 2] = 0.8 if (lock_in_days[i] > 365 * 5 or lock_in_days[i] < 30) else 0.0
+        out[i, 3] = 1.0 - fee_transparency[i]
+    return out
+
+def _technical_kernel(ssl_valid, domain_age_days, similarity, app_rating, has_legal_docs):
+    """Column-wise extract_technical_features; returns an (N, 5) float32 array"""
+    n = ssl_valid.shape[0]
+    out = np.empty((n, 5), dtype=np.float32)
+    for i in range(n):
+        out[i, 0] = ssl_valid[i]
+        out[i, 1] = (365 - domain_age_days[i]) / 365 if domain_age_days[i] < 365 else 0.0
+        out[i, 2] = similarity[i]
+        out[i, 3] = max(0.0, (4.0 - app_rating[i]) / 4.0)
+        out[i, 4] = 0.0 if has_legal_docs[i] else 0.5
+    return out
+
+if njit is not None:
+    _financial_kernel = njit(cache=True)(_financial_kernel)
+    _technical_kernel = njit(cache=True)(_technical_kernel)
+
 class FraudFeatureExtractor:
     """Extract features from various data sources for fraud detection"""
     
+    # Fixed column layout of the handcrafted features; the text embedding follows these columns
+    FEATURE_NAMES = (
+        'text_keyword_score', 'text_pattern_score', 'text_urgency_score', 'text_guarantee_score',
+        'advisor_sebi_valid', 'advisor_expiry_risk', 'advisor_compliance_score',
+        'advisor_negative_sentiment', 'advisor_experience',
+        'social_platform_risk', 'social_user_credibility', 'social_engagement_anomaly',
+        'social_bot_probability', 'social_fraud_pattern_match',
+        'financial_unrealistic_returns', 'financial_min_investment_risk', 'financial_lockin_risk',
+        'financial_fee_transparency',
+        'tech_ssl_valid', 'tech_domain_risk', 'tech_similarity_score', 'tech_app_rating_risk',
+        'tech_legal_docs_missing'
+    )
+    FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+    FEATURE_DIM = len(FEATURE_NAMES) + TEXT_EMBEDDING_DIM
+    # Risk score name -> (input data source, contiguous feature columns averaged into it)
+    CATEGORY_SLICES = {
+        'text_risk': ('text', slice(FEATURE_INDEX['text_keyword_score'],
+                                    FEATURE_INDEX['text_guarantee_score'] + 1)),
+        'advisor_risk': ('advisorData', slice(FEATURE_INDEX['advisor_sebi_valid'],
+                                              FEATURE_INDEX['advisor_experience'] + 1)),
+        'social_risk': ('socialData', slice(FEATURE_INDEX['social_platform_risk'],
+                                            FEATURE_INDEX['social_fraud_pattern_match'] + 1)),
+        'financial_risk': ('financialData', slice(FEATURE_INDEX['financial_unrealistic_returns'],
+                                                  FEATURE_INDEX['financial_fee_transparency'] + 1)),
+        'technical_risk': ('technicalData', slice(FEATURE_INDEX['tech_ssl_valid'],
+                                                  FEATURE_INDEX['tech_legal_docs_missing'] + 1))
+    }
+    
+    # Handcrafted feature columns of each input data source
+    SOURCE_SLICES = {source: columns for source, columns in CATEGORY_SLICES.values()}
+    
     def __init__(self):
         self.financial_keywords = [
             'guaranteed', 'risk-free', 'double money', 'insider', 'secret',
@@ -45,84 +133,195 @@ class FraudFeatureExtractor:
             r'sure\s+shot\s+profit',
             r'no\s+risk\s+investment'
         ]
+        
+        self.urgency_words = ['urgent', 'limited time', 'act now', 'hurry', 'deadline', 'expires']
+        # Literal equivalents of the guarantee regexes (r'guaranteed?' matches wherever 'guarantee' does)
+        self.guarantee_phrases = ['guarantee', '100%', 'sure', 'certain', 'promise']
+        
+        # Compile once; the union regex lets text with no match at all exit after a single scan
+        self._suspicious_res = [re.compile(p) for p in self.suspicious_patterns]
+        self._suspicious_any = re.compile('|'.join(f'(?:{p})' for p in self.suspicious_patterns))
+        
+        # With Hyperscan, all suspicious patterns are matched in one scan
+        self._hs_db = None
+        if hyperscan is not None:
+            self._hs_db = self._build_hyperscan_db(self.suspicious_patterns)
+            # A database's scratch space serves one scan at a time
+            self._hs_lock = threading.Lock()
+        
+        # Keyword, urgency and guarantee phrases are plain substrings: one automaton counts all three
+        self._phrase_categories = (self.financial_keywords, self.urgency_words, self.guarantee_phrases)
+        self._phrase_automaton = None
+        if ahocorasick is not None:
+            self._phrase_automaton = self._build_phrase_automaton(self._phrase_categories)
+    
+    @staticmethod
+    def _build_hyperscan_db(patterns: List[str]):
+        """Compile patterns into a block-mode database reporting each pattern id at most once"""
+        flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        db = hyperscan.Database()
+        db.compile(expressions=[p.encode() for p in patterns], ids=list(range(len(patterns))),
+                   elements=len(patterns), flags=[flags] * len(patterns))
+        return db
+    
+    def _scan_hyperscan(self, text: str) -> int:
+        """Return the number of distinct suspicious patterns found in text"""
+        matched = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+        
+        with self._hs_lock:
+            self._hs_db.scan(text.encode('utf-8'), match_event_handler=on_match)
+        
+        return len(matched)
     
-    def extract_text_features(self, text: str) -> Dict[str, float]:
+    @staticmethod
+    def _build_phrase_automaton(categories: Tuple[List[str], ...]):
+        """Build an Aho-Corasick automaton mapping each phrase to its (category, phrase) ids"""
+        # A phrase can belong to several categories ('urgent' is both a keyword and an urgency word)
+        entries = {}
+        for category_id, phrases in enumerate(categories):
+            for phrase_id, phrase in enumerate(phrases):
+                entries.setdefault(phrase, []).append((category_id, phrase_id))
+        
+        automaton = ahocorasick.Automaton()
+        for phrase, ids in entries.items():
+            automaton.add_word(phrase, tuple(ids))
+        automaton.make_automaton()
+        return automaton
+    
+    def _count_phrases(self, text: str) -> List[int]:
+        """Count the distinct phrases of each category that occur in text"""
+        if self._phrase_automaton is None:
+            return [sum(1 for phrase in phrases if phrase in text) for phrases in self._phrase_categories]
+        
+        matched = set()
+        for _, ids in self._phrase_automaton.iter(text):
+            matched.update(ids)
+        
+        counts = [0] * len(self._phrase_categories)
+        for category_id, _ in matched:
+            counts[category_id] += 1
+        return counts
+    
+    def _feature_row(self, out: Optional[np.ndarray]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """Return the zeroed row the extractors write into, allocating one if none is given"""
+        if out is None:
+            out = np.zeros(self.FEATURE_DIM, dtype=np.float32)
+        return out, self.FEATURE_INDEX
+    
+    @staticmethod
+    def _count_patterns(any_re: re.Pattern, pattern_res: List[re.Pattern], text: str) -> int:
+        """Count how many distinct patterns occur in text"""
+        if not any_re.search(text):
+            return 0
+        return sum(1 for pattern in pattern_res if pattern.search(text))
+    
+    def extract_text_features(self, text: str, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Extract fraud-related features from text content"""
-        features = {}
+        out, index = self._feature_row(out)
         
         if not text:
-            return {f'text_{k}': 0.0 for k in ['keyword_score', 'pattern_score', 'urgency_score', 'guarantee_score']}
+            return out
         
         text_lower = text.lower()
+        keyword_count, urgency_count, guarantee_count = self._count_phrases(text_lower)
         
         # Keyword-based features
-        keyword_count = sum(1 for keyword in self.financial_keywords if keyword in text_lower)
-        features['text_keyword_score'] = min(keyword_count / len(self.financial_keywords), 1.0)
+        out[index['text_keyword_score']] = min(keyword_count / len(self.financial_keywords), 1.0)
         
         # Pattern matching
-        pattern_matches = sum(1 for pattern in self.suspicious_patterns 
-                            if re.search(pattern, text_lower))
-        features['text_pattern_score'] = min(pattern_matches / len(self.suspicious_patterns), 1.0)
+        if self._hs_db is not None:
+            pattern_matches = self._scan_hyperscan(text_lower)
+        else:
+            pattern_matches = self._count_patterns(self._suspicious_any, self._suspicious_res, text_lower)
+        out[index['text_pattern_score']] = min(pattern_matches / len(self.suspicious_patterns), 1.0)
         
         # Urgency indicators
-        urgency_words = ['urgent', 'limited time', 'act now', 'hurry', 'deadline', 'expires']
-        urgency_count = sum(1 for word in urgency_words if word in text_lower)
-        features['text_urgency_score'] = min(urgency_count / len(urgency_words), 1.0)
+        out[index['text_urgency_score']] = min(urgency_count / len(self.urgency_words), 1.0)
         
         # Guarantee claims
-        guarantee_patterns = [r'guaranteed?', r'100%', r'sure', r'certain', r'promise']
-        guarantee_count = sum(1 for pattern in guarantee_patterns 
-                            if re.search(pattern, text_lower))
-        features['text_guarantee_score'] = min(guarantee_count / len(guarantee_patterns), 1.0)
+        out[index['text_guarantee_score']] = min(guarantee_count / len(self.guarantee_phrases), 1.0)
         
-        return features
+        return out
     
-    def extract_advisor_features(self, advisor_data: Dict) -> Dict[str, float]:
+    def extract_advisor_features(self, advisor_data: Dict, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Extract features from advisor information"""
-        features = {}
+        out, index = self._feature_row(out)
         
         # SEBI registration validity
-        features['advisor_sebi_valid'] = 1.0 if advisor_data.get('sebiValid') else 0.0
+        out[index['advisor_sebi_valid']] = 1.0 if advisor_data.get('sebiValid') else 0.0
         
         # License expiry status
         if advisor_data.get('expiryDate'):
             expiry_date = datetime.fromisoformat(advisor_data['expiryDate'].replace('Z', '+00:00'))
             days_to_expiry = (expiry_date - datetime.now()).days
-            features['advisor_expiry_risk'] = max(0, (30 - days_to_expiry) / 30) if days_to_expiry < 30 else 0
+            out[index['advisor_expiry_risk']] = max(0, (30 - days_to_expiry) / 30) if days_to_expiry < 30 else 0
         else:
-            features['advisor_expiry_risk'] = 1.0
+            out[index['advisor_expiry_risk']] = 1.0
         
         # Compliance history
         compliance_issues = advisor_data.get('complianceIssues', [])
-        features['advisor_compliance_score'] = min(len(compliance_issues) / 5, 1.0)
+        out[index['advisor_compliance_score']] = min(len(compliance_issues) / 5, 1.0)
         
         # Social media sentiment
         sentiment = advisor_data.get('socialSentiment', {})
-        features['advisor_negative_sentiment'] = sentiment.get('negative', 0)
+        out[index['advisor_negative_sentiment']] = sentiment.get('negative', 0)
         
         # Years of operation
         if advisor_data.get('registrationDate'):
             reg_date = datetime.fromisoformat(advisor_data['registrationDate'].replace('Z', '+00:00'))
             years_operating = (datetime.now() - reg_date).days / 365
-            features['advisor_experience'] = min(years_operating / 10, 1.0)  # Normalize to 10 years
+            out[index['advisor_experience']] = min(years_operating / 10, 1.0)  # Normalize to 10 years
         else:
-            features['advisor_experience'] = 0.0
+            out[index['advisor_experience']] = 0.0
+        
+        return out
+    
+    def extract_advisor_features_batch(self, advisor_dicts: List[Dict]) -> np.ndarray:
+        """Vectorized extract_advisor_features; returns an (N, 5) array in SOURCE_SLICES column order"""
+        features = np.empty((len(advisor_dicts), 5), dtype=np.float32)
+        now = pd.Timestamp.now(tz='UTC')
+        
+        # SEBI registration validity
+        features[:, 0] = [1.0 if d.get('sebiValid') else 0.0 for d in advisor_dicts]
+        
+        # License expiry status; missing or unparseable dates count as full risk
+        expiry_dates = pd.to_datetime([d.get('expiryDate') or None for d in advisor_dicts],
+                                      utc=True, errors='coerce', format='ISO8601')
+        days_to_expiry = np.asarray((expiry_dates - now).days, dtype=np.float64)
+        features[:, 1] = np.where(np.isnan(days_to_expiry), 1.0,
+                                  np.where(days_to_expiry < 30, (30 - days_to_expiry) / 30, 0.0))
+        
+        # Compliance history
+        compliance_counts = np.array([len(d.get('complianceIssues', [])) for d in advisor_dicts])
+        features[:, 2] = np.minimum(compliance_counts / 5, 1.0)
+        
+        # Social media sentiment
+        features[:, 3] = [d.get('socialSentiment', {}).get('negative', 0) for d in advisor_dicts]
+        
+        # Years of operation, normalized to 10 years
+        registration_dates = pd.to_datetime([d.get('registrationDate') or None for d in advisor_dicts],
+                                            utc=True, errors='coerce', format='ISO8601')
+        years_operating = np.asarray((now - registration_dates).days, dtype=np.float64) / 365
+        features[:, 4] = np.where(np.isnan(years_operating), 0.0, np.minimum(years_operating / 10, 1.0))
         
         return features
     
-    def extract_social_media_features(self, social_data: Dict) -> Dict[str, float]:
+    def extract_social_media_features(self, social_data: Dict, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Extract features from social media content"""
-        features = {}
+        out, index = self._feature_row(out)
         
         # Platform credibility (some platforms are more prone to fraud)
         platform_risk = {
             'TELEGRAM': 0.8, 'WHATSAPP': 0.7, 'TWITTER': 0.4,
             'FACEBOOK': 0.5, 'INSTAGRAM': 0.3, 'LINKEDIN': 0.2
         }
-        features['social_platform_risk'] = platform_risk.get(social_data.get('platform'), 0.5)
+        out[index['social_platform_risk']] = platform_risk.get(social_data.get('platform'), 0.5)
         
         # User credibility
-        features['social_user_credibility'] = 1.0 - social_data.get('userCredibility', 0.5)
+        out[index['social_user_credibility']] = 1.0 - social_data.get('userCredibility', 0.5)
         
         # Engagement anomalies
         engagement = social_data.get('engagement', {})
@@ -132,67 +331,87 @@ class FraudFeatureExtractor:
         
         # Suspicious if engagement is too high (bot activity) or too low (fake content)
         if engagement_ratio > 0.5 or engagement_ratio < 0.01:
-            features['social_engagement_anomaly'] = 0.8
+            out[index['social_engagement_anomaly']] = 0.8
         else:
-            features['social_engagement_anomaly'] = 0.0
+            out[index['social_engagement_anomaly']] = 0.0
         
         # Posting frequency (accounts that post too frequently might be bots)
         post_frequency = social_data.get('postFrequency', 1)  # posts per day
-        features['social_bot_probability'] = min(post_frequency / 50, 1.0)  # Normalize to 50 posts/day
+        out[index['social_bot_probability']] = min(post_frequency / 50, 1.0)  # Normalize to 50 posts/day
         
         # Content similarity to known fraud patterns
-        features['social_fraud_pattern_match'] = social_data.get('fraudPatternScore', 0)
+        out[index['social_fraud_pattern_match']] = social_data.get('fraudPatternScore', 0)
         
-        return features
+        return out
     
-    def extract_financial_features(self, financial_data: Dict) -> Dict[str, float]:
+    def extract_financial_features(self, financial_data: Dict, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Extract features from financial data"""
-        features = {}
+        out, index = self._feature_row(out)
         
         # Promised returns (unrealistic returns are fraud indicators)
         promised_returns = financial_data.get('promisedReturns', 0)
-        features['financial_unrealistic_returns'] = min(max(promised_returns - 15, 0) / 50, 1.0)  # >15% is suspicious
+        out[index['financial_unrealistic_returns']] = min(max(promised_returns - 15, 0) / 50, 1.0)  # >15% is suspicious
         
         # Investment amount requirements
         min_investment = financial_data.get('minInvestment', 0)
-        features['financial_min_investment_risk'] = 1.0 if min_investment > 100000 else min_investment / 100000
+        out[index['financial_min_investment_risk']] = 1.0 if min_investment > 100000 else min_investment / 100000
         
         # Lock-in period (very long or very short can be suspicious)
         lock_in_days = financial_data.get('lockInDays', 0)
         if lock_in_days > 365 * 5 or lock_in_days < 30:  # >5 years or <1 month
-            features['financial_lockin_risk'] = 0.8
+            out[index['financial_lockin_risk']] = 0.8
         else:
-            features['financial_lockin_risk'] = 0.0
+            out[index['financial_lockin_risk']] = 0.0
         
         # Fee structure transparency
-        features['financial_fee_transparency'] = 1.0 - financial_data.get('feeTransparency', 1.0)
+        out[index['financial_fee_transparency']] = 1.0 - financial_data.get('feeTransparency', 1.0)
         
-        return features
+        return out
+    
+    def extract_financial_features_batch(self, financial_dicts: List[Dict]) -> np.ndarray:
+        """Batched extract_financial_features; returns an (N, 4) array in SOURCE_SLICES column order"""
+        return _financial_kernel(
+            np.array([d.get('promisedReturns', 0) for d in financial_dicts], dtype=np.float64),
+            np.array([d.get('minInvestment', 0) for d in financial_dicts], dtype=np.float64),
+            np.array([d.get('lockInDays', 0) for d in financial_dicts], dtype=np.float64),
+            np.array([d.get('feeTransparency', 1.0) for d in financial_dicts], dtype=np.float64)
+        )
     
-    def extract_technical_features(self, technical_data: Dict) -> Dict[str, float]:
+    def extract_technical_features(self, technical_data: Dict, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Extract features from technical analysis (website, app, etc.)"""
-        features = {}
+        out, index = self._feature_row(out)
         
         # SSL certificate validity
-        features['tech_ssl_valid'] = 1.0 if technical_data.get('sslValid') else 0.0
+        out[index['tech_ssl_valid']] = 1.0 if technical_data.get('sslValid') else 0.0
         
         # Domain age (newer domains are riskier)
         domain_age_days = technical_data.get('domainAgeDays', 0)
-        features['tech_domain_risk'] = max(0, (365 - domain_age_days) / 365) if domain_age_days < 365 else 0
+        out[index['tech_domain_risk']] = max(0, (365 - domain_age_days) / 365) if domain_age_days < 365 else 0
         
         # Website similarity to legitimate sites (phishing indicator)
-        features['tech_similarity_score'] = technical_data.get('similarityToLegitSites', 0)
+        out[index['tech_similarity_score']] = technical_data.get('similarityToLegitSites', 0)
         
         # Mobile app store ratings
         app_rating = technical_data.get('appStoreRating', 5.0)
-        features['tech_app_rating_risk'] = max(0, (4.0 - app_rating) / 4.0)  # <4.0 is suspicious
+        out[index['tech_app_rating_risk']] = max(0, (4.0 - app_rating) / 4.0)  # <4.0 is suspicious
         
         # Privacy policy and terms presence
         has_privacy_policy = technical_data.get('hasPrivacyPolicy', False)
         has_terms = technical_data.get('hasTerms', False)
-        features['tech_legal_docs_missing'] = 0.0 if (has_privacy_policy and has_terms) else 0.5
+        out[index['tech_legal_docs_missing']] = 0.0 if (has_privacy_policy and has_terms) else 0.5
         
-        return features
+        return out
+    
+    def extract_technical_features_batch(self, technical_dicts: List[Dict]) -> np.ndarray:
+        """Batched extract_technical_features; returns an (N, 5) array in SOURCE_SLICES column order"""
+        return _technical_kernel(
+            np.array([1.0 if d.get('sslValid') else 0.0 for d in technical_dicts]),
+            np.array([d.get('domainAgeDays', 0) for d in technical_dicts], dtype=np.float64),
+            np.array([d.get('similarityToLegitSites', 0) for d in technical_dicts], dtype=np.float64),
+            np.array([d.get('appStoreRating', 5.0) for d in technical_dicts], dtype=np.float64),
+            np.array([bool(d.get('hasPrivacyPolicy', False) and d.get('hasTerms', False))
+                      for d in technical_dicts])
+        )
 
 class EnsembleFraudClassifier(nn.Module):
     """Neural network component of the ensemble model"""
@@ -216,32 +435,48 @@ class EnsembleFraudClassifier(nn.Module):
         layers.append(nn.Linear(prev_dim, 2))  # Binary classification
         
         self.model = nn.Sequential(*layers)
-        self.softmax = nn.Softmax(dim=1)
     
     def forward(self, x):
-        logits = self.model(x)
-        probabilities = self.softmax(logits)
-        return logits, probabilities
+        # Logits only; softmax is applied by callers that need probabilities
+        return self.model(x)
 
 class FraudClassifier:
     """Main fraud classification system using ensemble methods"""
     
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, quantize: bool = True,
+                 use_text_embeddings: bool = True):
         self.model_path = model_path
+        self.quantize = quantize
+        # Without text embeddings BERT is never loaded and rows hold only the handcrafted
+        # features: much faster, at some cost in accuracy on text-heavy inputs
+        self.use_text_embeddings = use_text_embeddings
         self.feature_extractor = FraudFeatureExtractor()
         self.scaler = StandardScaler()
         
         # Traditional ML models
         self.isolation_forest = IsolationForest(contamination=0.1, random_state=42)
         self.random_forest = RandomForestClassifier(n_estimators=100, random_state=42)
+        # ONNX Runtime session (and its serialized graph) standing in for the random forest
+        self._rf_session = None
+        self._rf_onnx = None
         
-        # Neural network model
+        # Neural network model; inference may use an int8 copy while the FP32 net is kept for saving
         self.neural_net = None
+        self._inference_net = None
         self.feature_dim = None
         
         # NLP model for text analysis
         self.tokenizer = None
         self.text_model = None
+        self.text_device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        
+        # LRU of CLS embeddings keyed by text digest
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        
+        # LRU of key -> (monotonic insert time, result) for repeated identical requests
+        self._prediction_cache = OrderedDict()
+        self._prediction_cache_lock = threading.Lock()
         
         self.is_trained = False
         
@@ -253,8 +488,11 @@ class FraudClassifier:
         try:
             self.tokenizer = AutoTokenizer.from_pretrained('bert-base-uncased')
             self.text_model = AutoModel.from_pretrained('bert-base-uncased')
-            self.text_model.eval()
-            logger.info("NLP model initialized successfully")
+            self.text_model.to(self.text_device).eval()
+            if self.text_device.type == 'cuda':
+                self.text_model.half()
+            self._clear_embedding_cache()
+            logger.info(f"NLP model initialized successfully on {self.text_device}")
         except Exception as e:
             logger.error(f"Failed to initialize NLP model: {e}")
             self.tokenizer = None
@@ -262,67 +500,156 @@ class FraudClassifier:
     
     def extract_text_embeddings(self, text: str) -> np.ndarray:
         """Extract BERT embeddings from text"""
-        if not self.tokenizer or not self.text_model or not text:
-            return np.zeros(768)  # BERT base embedding size
-        
-        try:
-            inputs = self.tokenizer(text, return_tensors='pt', truncation=True, 
-                                  padding=True, max_length=512)
+        return self.extract_text_embeddings_batch([text])[0]
+    
+    def extract_text_embeddings_batch(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Extract BERT CLS embeddings for many texts, one forward pass per batch.
+        
+        Texts shorter than MIN_EMBEDDING_WORDS words get a zero embedding.
+        """
+        embeddings = np.zeros((len(texts), TEXT_EMBEDDING_DIM), dtype=np.float32)
+        if not self.tokenizer or not self.text_model:
+            return embeddings
+        
+        # Serve repeated texts from the cache; only misses go through BERT
+        keys = {}
+        misses = []
+        with self._embedding_cache_lock:
+            for i, text in enumerate(texts):
+                if not text or len(text.split()) < MIN_EMBEDDING_WORDS:
+                    continue
+                key = keys[i] = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+                cached = self._embedding_cache.get(key)
+                if cached is not None:
+                    self._embedding_cache.move_to_end(key)
+                    embeddings[i] = cached
+                else:
+                    misses.append(i)
+        
+        # Sort by length so each batch pads to roughly its own length rather than the longest text
+        order = sorted(misses, key=lambda i: len(texts[i]))
+        use_cuda = self.text_device.type == 'cuda'
+        
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            try:
+                inputs = self.tokenizer([texts[i] for i in indices], return_tensors='pt',
+                                      truncation=True, padding=True, max_length=512)
+                inputs = {k: v.to(self.text_device, non_blocking=True) for k, v in inputs.items()}
+                
+                with torch.inference_mode(), torch.autocast('cuda', dtype=torch.float16, enabled=use_cuda):
+                    outputs = self.text_model(**inputs)
+                    # Use CLS token embedding
+                    embeddings[indices] = outputs.last_hidden_state[:, 0, :].float().cpu().numpy()
+            
+            except Exception as e:
+                logger.error(f"Text embedding extraction failed: {e}")
+                continue
             
-            with torch.no_grad():
-                outputs = self.text_model(**inputs)
-                # Use CLS token embedding
-                embeddings = outputs.last_hidden_state[:, 0, :].numpy()
-                return embeddings.flatten()
+            with self._embedding_cache_lock:
+                for i in indices:
+                    self._embedding_cache[keys[i]] = embeddings[i].copy()
+                while len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                    self._embedding_cache.popitem(last=False)
         
-        except Exception as e:
-            logger.error(f"Text embedding extraction failed: {e}")
-            return np.zeros(768)
+        return embeddings
     
-    def prepare_features(self, data: Dict) -> np.ndarray:
-        """Prepare feature vector from input data"""
-        features = {}
+    def _clear_embedding_cache(self):
+        """Drop cached embeddings after the text model changes"""
+        with self._embedding_cache_lock:
+            self._embedding_cache.clear()
+    
+    def _batch_text_embeddings(self, data_list: List[Dict]) -> List[Optional[np.ndarray]]:
+        """Embed the text of every record that has one in batched BERT calls"""
+        embeddings = [None] * len(data_list)
+        text_rows = [i for i, data in enumerate(data_list) if 'text' in data]
+        
+        if text_rows and self.use_text_embeddings:
+            batch = self.extract_text_embeddings_batch([data_list[i]['text'] for i in text_rows])
+            for i, embedding in zip(text_rows, batch):
+                embeddings[i] = embedding
         
-        # Extract features from different data sources
+        return embeddings
+    
+    def prepare_features(self, data: Dict, out: Optional[np.ndarray] = None,
+                         text_embedding: Optional[np.ndarray] = None,
+                         batched_sources: Tuple[str, ...] = ()) -> np.ndarray:
+        """Prepare feature vector from input data.
+        
+        Features are written by column into ``out`` (a zeroed float32 row of
+        ``_row_width`` columns), so every record has the same column layout and
+        missing sources stay zero. ``text_embedding`` may be passed in when it was already
+        computed in a batch; sources listed in ``batched_sources`` were already written
+        into ``out`` by a batch extractor and are skipped.
+        """
+        extractor = self.feature_extractor
+        if out is None:
+            out = np.zeros(self._row_width, dtype=np.float32)
+        
+        # Each extractor writes its columns in place
         if 'text' in data:
-            text_features = self.feature_extractor.extract_text_features(data['text'])
-            features.update(text_features)
+            extractor.extract_text_features(data['text'], out)
         
-        if 'advisorData' in data:
-            advisor_features = self.feature_extractor.extract_advisor_features(data['advisorData'])
-            features.update(advisor_features)
+        if 'advisorData' in data and 'advisorData' not in batched_sources:
+            extractor.extract_advisor_features(data['advisorData'], out)
         
         if 'socialData' in data:
-            social_features = self.feature_extractor.extract_social_media_features(data['socialData'])
-            features.update(social_features)
+            extractor.extract_social_media_features(data['socialData'], out)
         
-        if 'financialData' in data:
-            financial_features = self.feature_extractor.extract_financial_features(data['financialData'])
-            features.update(financial_features)
+        if 'financialData' in data and 'financialData' not in batched_sources:
+            extractor.extract_financial_features(data['financialData'], out)
         
-        if 'technicalData' in data:
-            technical_features = self.feature_extractor.extract_technical_features(data['technicalData'])
-            features.update(technical_features)
+        if 'technicalData' in data and 'technicalData' not in batched_sources:
+            extractor.extract_technical_features(data['technicalData'], out)
         
-        # Convert to numpy array
-        feature_vector = np.array(list(features.values()))
+        # Text embeddings fill the tail of the row
+        if 'text' in data and self.use_text_embeddings:
+            if text_embedding is None:
+                text_embedding = self.extract_text_embeddings(data['text'])
+            out[len(extractor.FEATURE_NAMES):] = text_embedding
         
-        # Add text embeddings if available
-        if 'text' in data:
-            text_embeddings = self.extract_text_embeddings(data['text'])
-            feature_vector = np.concatenate([feature_vector, text_embeddings])
+        return out
+    
+    @property
+    def _row_width(self) -> int:
+        """Columns per feature row: handcrafted features, plus the text embedding when enabled"""
+        width = len(self.feature_extractor.FEATURE_NAMES)
+        return width + TEXT_EMBEDDING_DIM if self.use_text_embeddings else width
+    
+    def _prepare_feature_matrix(self, data_list: List[Dict]) -> np.ndarray:
+        """Fill a preallocated (N, _row_width) float32 matrix, one row per record"""
+        X = np.zeros((len(data_list), self._row_width), dtype=np.float32)
+        embeddings = self._batch_text_embeddings(data_list)
+        
+        # Advisor, financial and technical columns are computed for the whole batch at once
+        extractor = self.feature_extractor
+        batch_extractors = {
+            'advisorData': extractor.extract_advisor_features_batch,
+            'financialData': extractor.extract_financial_features_batch,
+            'technicalData': extractor.extract_technical_features_batch
+        }
+        for source, extract_batch in batch_extractors.items():
+            rows = [i for i, data in enumerate(data_list) if source in data]
+            if rows:
+                X[rows, extractor.SOURCE_SLICES[source]] = extract_batch(
+                    [data_list[i][source] for i in rows])
         
-        return feature_vector
+        batched_sources = tuple(batch_extractors)
+        for i, data in enumerate(data_list):
+            self.prepare_features(data, X[i], embeddings[i], batched_sources)
+        
+        return X
     
     def train(self, training_data: List[Dict], labels: List[int]):
         """Train the ensemble fraud classifier"""
         logger.info(f"Training fraud classifier with {len(training_data)} samples")
         
         # Initialize NLP model
-        self.initialize_nlp_model()
+        if self.use_text_embeddings:
+            self.initialize_nlp_model()
         
         # Prepare features
-        X = np.array([self.prepare_features(data) for data in training_data])
+        X = self._prepare_feature_matrix(training_data)
         y = np.array(labels)
         
         # Store feature dimension
@@ -336,110 +663,236 @@ class FraudClassifier:
         self.isolation_forest.fit(X_scaled[y == 0])  # Train only on normal samples
         
         logger.info("Training Random Forest...")
+        if self.random_forest is None:
+            # Loaded models may only carry the ONNX graph
+            self.random_forest = RandomForestClassifier(n_estimators=100, random_state=42)
+        self._rf_session = None
+        self._rf_onnx = None
         self.random_forest.fit(X_scaled, y)
         
+        # Serve the forest through ONNX Runtime's vectorized tree ensemble when it can be exported
+        rf_onnx = self._export_random_forest_onnx()
+        if rf_onnx:
+            self._load_random_forest_session(rf_onnx)
+        
         # Train neural network
         logger.info("Training Neural Network...")
         self.neural_net = EnsembleFraudClassifier(self.feature_dim)
+        self._inference_net = None
         self._train_neural_net(X_scaled, y)
         
         self.is_trained = True
+        self._clear_prediction_cache()
         logger.info("Fraud classifier training completed")
     
-    def _train_neural_net(self, X: np.ndarray, y: np.ndarray, epochs: int = 100):
-        """Train the neural network component"""
-        X_tensor = torch.FloatTensor(X)
-        y_tensor = torch.LongTensor(y)
-        
+    def _train_neural_net(self, X: np.ndarray, y: np.ndarray, epochs: int = 100,
+                          batch_size: int = 256, patience: int = 10):
+        """Train the neural network component with shuffled mini-batches and early stopping"""
+        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        
+        dataset = TensorDataset(torch.from_numpy(np.asarray(X, dtype=np.float32)),
+                                torch.from_numpy(np.asarray(y, dtype=np.int64)))
+        # BatchNorm cannot train on a trailing batch of one, so drop the remainder when batching
+        loader = DataLoader(dataset, batch_size=batch_size, shuffle=True,
+                            drop_last=len(dataset) > batch_size,
+                            pin_memory=device.type == 'cuda', num_workers=0)
+        
+        self.neural_net.to(device)
         optimizer = torch.optim.Adam(self.neural_net.parameters(), lr=0.001, weight_decay=1e-5)
         criterion = nn.CrossEntropyLoss()
         
+        best_loss = float('inf')
+        stale_epochs = 0
+        
         self.neural_net.train()
         
         for epoch in range(epochs):
-            optimizer.zero_grad()
-            logits, _ = self.neural_net(X_tensor)
-            loss = criterion(logits, y_tensor)
-            loss.backward()
-            optimizer.step()
+            # Accumulate on device and sync once per epoch
+            epoch_loss = torch.zeros((), device=device)
+            seen = 0
+            
+            for xb, yb in loader:
+                xb = xb.to(device, non_blocking=True)
+                yb = yb.to(device, non_blocking=True)
+                
+                optimizer.zero_grad(set_to_none=True)
+                loss = criterion(self.neural_net(xb), yb)
+                loss.backward()
+                optimizer.step()
+                
+                epoch_loss += loss.detach() * len(xb)
+                seen += len(xb)
+            
+            epoch_loss = epoch_loss.item() / seen
             
             if epoch % 20 == 0:
-                logger.info(f"Neural net training epoch {epoch}, loss: {loss.item():.4f}")
-        
+                logger.info(f"Neural net training epoch {epoch}, loss: {epoch_loss:.4f}")
+            
+            # Stop once the loss has plateaued
+            if epoch_loss < best_loss - 1e-4:
+                best_loss = epoch_loss
+                stale_epochs = 0
+            else:
+                stale_epochs += 1
+                if stale_epochs >= patience:
+                    logger.info(f"Neural net early stopping at epoch {epoch}, loss: {epoch_loss:.4f}")
+                    break
+        
+        # Inference runs on CPU
+        self.neural_net.to('cpu')
         self.neural_net.eval()
     
     def predict(self, data: Dict) -> FraudPredictionResult:
         """Predict fraud probability for given data"""
+        return self.predict_batch([data])[0]
+    
+    def predict_batch(self, data_list: List[Dict], batch_size: int = 256) -> List[FraudPredictionResult]:
+        """Predict fraud probability for many records, running each model once per chunk"""
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
         
-        # Prepare features
-        feature_vector = self.prepare_features(data)
-        X = feature_vector.reshape(1, -1)
-        X_scaled = self.scaler.transform(X)
+        keys = [self._prediction_cache_key(data) for data in data_list]
+        results = self._get_cached_predictions(keys)
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        # Chunk large inputs so the feature matrix and NN activations stay bounded
+        for start in range(0, len(misses), batch_size):
+            indices = misses[start:start + batch_size]
+            chunk = [data_list[i] for i in indices]
+            X = self._prepare_feature_matrix(chunk)
+            for i, result in zip(indices, self._predict_features(chunk, X)):
+                results[i] = result
+            self._cache_predictions([(keys[i], results[i]) for i in indices])
         
-        # Get predictions from all models
-        model_predictions = {}
+        return results
+    
+    @staticmethod
+    def _prediction_cache_key(data: Dict) -> Optional[bytes]:
+        """Stable digest of a request, or None if it is unserializable or too large to cache"""
+        try:
+            payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+        except (TypeError, ValueError):
+            return None
+        
+        if len(payload) > PREDICTION_CACHE_MAX_BYTES:
+            return None
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _get_cached_predictions(self, keys: List[Optional[bytes]]) -> List[Optional[FraudPredictionResult]]:
+        """Look up fresh cached results; callers get copies so the cache cannot be mutated"""
+        results = [None] * len(keys)
+        now = time.monotonic()
+        
+        with self._prediction_cache_lock:
+            for i, key in enumerate(keys):
+                entry = self._prediction_cache.get(key) if key is not None else None
+                if entry is None:
+                    continue
+                if now - entry[0] >= PREDICTION_CACHE_TTL:
+                    del self._prediction_cache[key]
+                    continue
+                self._prediction_cache.move_to_end(key)
+                results[i] = copy.deepcopy(entry[1])
+        
+        return results
+    
+    def _cache_predictions(self, entries: List[Tuple[Optional[bytes], FraudPredictionResult]]):
+        """Store results, evicting the least recently used beyond PREDICTION_CACHE_SIZE"""
+        now = time.monotonic()
+        
+        with self._prediction_cache_lock:
+            for key, result in entries:
+                if key is not None:
+                    self._prediction_cache[key] = (now, copy.deepcopy(result))
+                    self._prediction_cache.move_to_end(key)
+            while len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+                self._prediction_cache.popitem(last=False)
+    
+    def _clear_prediction_cache(self):
+        """Drop cached predictions after the models change"""
+        with self._prediction_cache_lock:
+            self._prediction_cache.clear()
+    
+    def _predict_features(self, data_list: List[Dict], X: np.ndarray) -> List[FraudPredictionResult]:
+        """Run the ensemble over a prepared feature matrix"""
+        X_scaled = self.scaler.transform(X)
         
-        # Isolation Forest (anomaly detection)
-        iso_pred = self.isolation_forest.predict(X_scaled)[0]
-        iso_score = self.isolation_forest.score_samples(X_scaled)[0]
-        model_predictions['isolation_forest'] = float(1 if iso_pred == -1 else 0)
+        # Isolation Forest (anomaly detection): one tree traversal, thresholded the way predict() does
+        iso_score = self.isolation_forest.score_samples(X_scaled)
+        iso_fraud = (iso_score < self.isolation_forest.offset_).astype(np.float64)
         
-        # Random Forest
-        rf_prob = self.random_forest.predict_proba(X_scaled)[0]
-        model_predictions['random_forest'] = float(rf_prob[1])  # Probability of fraud class
+        # Random Forest (probability of fraud class)
+        if self._rf_session is not None:
+            rf_fraud = self._rf_session.run(None, {'X': X_scaled.astype(np.float32, copy=False)})[1][:, 1]
+        else:
+            rf_fraud = self.random_forest.predict_proba(X_scaled)[:, 1]
         
         # Neural Network
         X_tensor = torch.FloatTensor(X_scaled)
-        with torch.no_grad():
-            _, nn_prob = self.neural_net(X_tensor)
-            model_predictions['neural_network'] = float(nn_prob[0][1])
+        neural_net = self._inference_net if self._inference_net is not None else self.neural_net
+        with torch.inference_mode():
+            logits = neural_net(X_tensor)
+            nn_fraud = F.softmax(logits, dim=1)[:, 1].numpy()
         
         # Ensemble prediction (weighted average)
         weights = {'isolation_forest': 0.2, 'random_forest': 0.4, 'neural_network': 0.4}
-        fraud_probability = sum(model_predictions[model] * weights[model] 
-                              for model in model_predictions.keys())
+        fraud_probabilities = (iso_fraud * weights['isolation_forest'] +
+                               rf_fraud * weights['random_forest'] +
+                               nn_fraud * weights['neural_network'])
         
         # Determine if fraud based on threshold
         fraud_threshold = 0.5
-        is_fraud = fraud_probability > fraud_threshold
-        
-        # Calculate confidence (distance from threshold)
-        confidence = abs(fraud_probability - fraud_threshold) * 2
-        confidence = min(confidence, 1.0)
-        
-        # Extract risk factors
-        risk_factors = self._extract_risk_factors(data, fraud_probability)
         
-        # Generate explanation
-        explanation = self._generate_explanation(model_predictions, risk_factors, is_fraud)
-        
-        # Calculate individual risk scores
-        risk_scores = self._calculate_risk_scores(data)
-        
-        return FraudPredictionResult(
-            is_fraud=is_fraud,
-            confidence=confidence,
-            fraud_probability=fraud_probability,
-            risk_factors=risk_factors,
-            risk_scores=risk_scores,
-            model_predictions=model_predictions,
-            explanation=explanation
-        )
+        results = []
+        for i, data in enumerate(data_list):
+            model_predictions = {
+                'isolation_forest': float(iso_fraud[i]),
+                'random_forest': float(rf_fraud[i]),
+                'neural_network': float(nn_fraud[i])
+            }
+            fraud_probability = float(fraud_probabilities[i])
+            is_fraud = fraud_probability > fraud_threshold
+            
+            # Calculate confidence (distance from threshold)
+            confidence = abs(fraud_probability - fraud_threshold) * 2
+            confidence = min(confidence, 1.0)
+            
+            # Risk factors and scores reuse the extracted feature row instead of re-extracting
+            risk_factors = self._extract_risk_factors(data, X[i], fraud_probability)
+            
+            # Generate explanation
+            explanation = self._generate_explanation(model_predictions, risk_factors, is_fraud)
+            
+            # Calculate individual risk scores
+            risk_scores = self._calculate_risk_scores(data, X[i])
+            
+            results.append(FraudPredictionResult(
+                is_fraud=is_fraud,
+                confidence=confidence,
+                fraud_probability=fraud_probability,
+                risk_factors=risk_factors,
+                risk_scores=risk_scores,
+                model_predictions=model_predictions,
+                explanation=explanation
+            ))
+        
+        return results
     
-    def _extract_risk_factors(self, data: Dict, fraud_prob: float) -> List[str]:
-        """Extract specific risk factors that contributed to the fraud prediction"""
+    def _extract_risk_factors(self, data: Dict, features: np.ndarray, fraud_prob: float) -> List[str]:
+        """Extract specific risk factors that contributed to the fraud prediction.
+        
+        ``features`` is the unscaled feature row prepared for ``data``.
+        """
         risk_factors = []
+        index = self.feature_extractor.FEATURE_INDEX
         
         # Text-based risk factors
         if 'text' in data and data['text']:
-            text_features = self.feature_extractor.extract_text_features(data['text'])
-            if text_features.get('text_guarantee_score', 0) > 0.3:
+            if features[index['text_guarantee_score']] > 0.3:
                 risk_factors.append("Unrealistic guarantee claims detected")
-            if text_features.get('text_urgency_score', 0) > 0.4:
+            if features[index['text_urgency_score']] > 0.4:
                 risk_factors.append("High-pressure urgency tactics identified")
-            if text_features.get('text_keyword_score', 0) > 0.5:
+            if features[index['text_keyword_score']] > 0.5:
                 risk_factors.append("Multiple fraud-related keywords found")
         
         # Advisor-specific risk factors
@@ -478,37 +931,13 @@ class FraudClassifier:
         
         return risk_factors
     
-    def _calculate_risk_scores(self, data: Dict) -> Dict[str, float]:
-        """Calculate risk scores for different categories"""
-        risk_scores = {
-            'text_risk': 0.0,
-            'advisor_risk': 0.0,
-            'social_risk': 0.0,
-            'financial_risk': 0.0,
-            'technical_risk': 0.0
+    def _calculate_risk_scores(self, data: Dict, features: np.ndarray) -> Dict[str, float]:
+        """Calculate risk scores for different categories from the unscaled feature row"""
+        # Each category is the mean of its contiguous block of columns; absent sources score 0
+        return {
+            score_name: float(features[columns].mean()) if source in data else 0.0
+            for score_name, (source, columns) in self.feature_extractor.CATEGORY_SLICES.items()
         }
-        
-        if 'text' in data:
-            text_features = self.feature_extractor.extract_text_features(data['text'])
-            risk_scores['text_risk'] = np.mean(list(text_features.values()))
-        
-        if 'advisorData' in data:
-            advisor_features = self.feature_extractor.extract_advisor_features(data['advisorData'])
-            risk_scores['advisor_risk'] = np.mean(list(advisor_features.values()))
-        
-        if 'socialData' in data:
-            social_features = self.feature_extractor.extract_social_media_features(data['socialData'])
-            risk_scores['social_risk'] = np.mean(list(social_features.values()))
-        
-        if 'financialData' in data:
-            financial_features = self.feature_extractor.extract_financial_features(data['financialData'])
-            risk_scores['financial_risk'] = np.mean(list(financial_features.values()))
-        
-        if 'technicalData' in data:
-            technical_features = self.feature_extractor.extract_technical_features(data['technicalData'])
-            risk_scores['technical_risk'] = np.mean(list(technical_features.values()))
-        
-        return risk_scores
     
     def _generate_explanation(self, model_predictions: Dict, risk_factors: List[str], is_fraud: bool) -> str:
         """Generate human-readable explanation of the prediction"""
@@ -536,60 +965,148 @@ class FraudClassifier:
         
         return explanation
     
+    @staticmethod
+    def _component_paths(path: str) -> Dict[str, str]:
+        """Sidecar files written next to the main model file"""
+        base = os.path.splitext(path)[0]
+        return {
+            'isolation_forest': f"{base}.iforest.joblib",
+            'neural_net': f"{base}.nn.pt",
+            'random_forest': f"{base}.rf.onnx"
+        }
+    
     def save_model(self, path: str):
-        """Save the trained model"""
+        """Save the trained model.
+        
+        The scaler and metadata go to ``path``; the Isolation Forest, neural net and
+        random forest (as ONNX when skl2onnx is installed) are written to sidecar files
+        so each can be loaded in its cheapest form.
+        """
         if not self.is_trained:
             raise ValueError("No trained model to save")
         
+        paths = self._component_paths(path)
+        rf_onnx = self._rf_onnx or self._export_random_forest_onnx()
+        
         model_data = {
             'scaler': self.scaler,
-            'isolation_forest': self.isolation_forest,
-            'random_forest': self.random_forest,
-            'neural_net_state': self.neural_net.state_dict() if self.neural_net else None,
+            'random_forest': None if rf_onnx else self.random_forest,
             'feature_dim': self.feature_dim,
+            'use_text_embeddings': self.use_text_embeddings,
             'is_trained': self.is_trained
         }
         
         joblib.dump(model_data, path)
+        joblib.dump(self.isolation_forest, paths['isolation_forest'])
+        if self.neural_net is not None:
+            torch.save(self.neural_net.state_dict(), paths['neural_net'])
+        if rf_onnx:
+            with open(paths['random_forest'], 'wb') as f:
+                f.write(rf_onnx)
+        
         logger.info(f"Model saved to {path}")
     
+    def _export_random_forest_onnx(self) -> Optional[bytes]:
+        """Convert the random forest to an ONNX graph, or return None without skl2onnx"""
+        try:
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+        except ImportError:
+            logger.warning("skl2onnx not installed, keeping the scikit-learn random forest")
+            return None
+        
+        # zipmap=False makes the probability output a plain (N, 2) tensor
+        onnx_model = convert_sklearn(
+            self.random_forest, initial_types=[('X', FloatTensorType([None, self.feature_dim]))],
+            options={id(self.random_forest): {'zipmap': False}})
+        return onnx_model.SerializeToString()
+    
+    def _load_random_forest_session(self, onnx_bytes: bytes):
+        """Create an optimized ONNX Runtime session for the random forest graph"""
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._rf_session = ort.InferenceSession(onnx_bytes, sess_options=options,
+                                                providers=["CPUExecutionProvider"])
+        self._rf_onnx = onnx_bytes
+    
     def load_model(self, path: str):
         """Load a trained model"""
         try:
             model_data = joblib.load(path)
+            paths = self._component_paths(path)
             
             self.scaler = model_data['scaler']
-            self.isolation_forest = model_data['isolation_forest']
-            self.random_forest = model_data['random_forest']
             self.feature_dim = model_data['feature_dim']
+            self.use_text_embeddings = model_data.get('use_text_embeddings', True)
             self.is_trained = model_data['is_trained']
             
-            if model_data['neural_net_state'] and self.feature_dim:
+            if 'neural_net_state' in model_data:
+                # Single-file layout written by older versions
+                self.isolation_forest = model_data['isolation_forest']
+                neural_net_state = model_data['neural_net_state']
+            else:
+                # Tree arrays are memory-mapped rather than copied into the process
+                self.isolation_forest = joblib.load(paths['isolation_forest'], mmap_mode='r')
+                neural_net_state = None
+                if os.path.exists(paths['neural_net']):
+                    neural_net_state = torch.load(paths['neural_net'], map_location='cpu',
+                                                  mmap=True, weights_only=True)
+            
+            self.random_forest = model_data['random_forest']
+            self._rf_session = None
+            self._rf_onnx = None
+            if self.random_forest is None:
+                with open(paths['random_forest'], 'rb') as f:
+                    self._load_random_forest_session(f.read())
+            
+            if neural_net_state and self.feature_dim:
                 self.neural_net = EnsembleFraudClassifier(self.feature_dim)
-                self.neural_net.load_state_dict(model_data['neural_net_state'])
+                self.neural_net.load_state_dict(neural_net_state)
                 self.neural_net.eval()
             
             # Initialize NLP model
-            self.initialize_nlp_model()
+            if self.use_text_embeddings:
+                self.initialize_nlp_model()
             
+            if self.quantize:
+                self._quantize_for_inference()
+            
+            self._clear_prediction_cache()
             logger.info(f"Model loaded from {path}")
             
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
     
+    def _quantize_for_inference(self):
+        """Swap the Linear layers of the neural net and BERT for int8 dynamic-quantized ones"""
+        try:
+            if self.neural_net is not None:
+                self._inference_net = torch.quantization.quantize_dynamic(
+                    self.neural_net, {nn.Linear}, dtype=torch.qint8)
+            
+            # Dynamic quantization is CPU-only; on CUDA BERT already runs in FP16
+            if self.text_model is not None and self.text_device.type == 'cpu':
+                self.text_model = torch.quantization.quantize_dynamic(
+                    self.text_model, {nn.Linear}, dtype=torch.qint8)
+                self._clear_embedding_cache()
+            
+            logger.info("Quantized fraud models to int8 for inference")
+        
+        except RuntimeError as e:
+            # No quantized engine (fbgemm/qnnpack) available on this platform
+            logger.warning(f"Dynamic quantization unavailable, using FP32 models: {e}")
+    
     def evaluate_model(self, test_data: List[Dict], test_labels: List[int]) -> Dict[str, float]:
         """Evaluate model performance on test data"""
         if not self.is_trained:
             raise ValueError("Model must be trained before evaluation")
         
-        predictions = []
-        probabilities = []
-        
-        for data in test_data:
-            result = self.predict(data)
-            predictions.append(1 if result.is_fraud else 0)
-            probabilities.append(result.fraud_probability)
+        results = self.predict_batch(test_data)
+        predictions = [1 if result.is_fraud else 0 for result in results]
+        probabilities = [result.fraud_probability for result in results]
         
         # Calculate metrics
         from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
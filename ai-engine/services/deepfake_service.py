@@ -3,20 +3,30 @@ import numpy as np
 import cv2
 import torch
 import torch.nn.functional as F
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 import time
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
-import hashlib
+import functools
+import itertools
+import uuid
+from collections import OrderedDict
 
+from config.settings import settings
 from models.deepfake_detector import DeepfakeDetector, DeepfakeResult
 from utils.preprocessing import VideoPreprocessor, AudioPreprocessor
 from utils.model_utils import ModelManager
 
 logger = logging.getLogger(__name__)
 
+class ServiceOverloaded(Exception):
+    """Raised when the analysis queue is full; the API answers 429"""
+
+class AnalysisNotFound(KeyError):
+    """Raised for an analysis ID that was never submitted or has been evicted; the API answers 404"""
+
 @dataclass
 class DeepfakeAnalysisRequest:
     file_path: str
@@ -25,6 +35,34 @@ class DeepfakeAnalysisRequest:
     user_id: str
     priority: int = 1  # 1=normal, 2=high, 3=critical
 
+@dataclass
+class AnalysisRecord:
+    """State of one analysis, created at submission and updated in place"""
+    analysis_id: str
+    file_type: str
+    status: str = 'queued'  # 'queued', 'processing', 'completed', 'failed'
+    timestamp: float = field(default_factory=time.time)
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    processing_time: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)  # set on completed/failed
+    
+    def to_dict(self) -> Dict:
+        """API representation of the record"""
+        record = {
+            'status': self.status,
+            'analysis_id': self.analysis_id,
+            'file_type': self.file_type,
+            'timestamp': self.timestamp
+        }
+        if self.result is not None:
+            record['result'] = self.result
+        if self.error is not None:
+            record['error'] = self.error
+        if self.processing_time is not None:
+            record['processing_time'] = self.processing_time
+        return record
+
 class DeepfakeService:
     """Advanced deepfake detection service with real-time processing capabilities"""
     
@@ -33,18 +71,49 @@ class DeepfakeService:
         self.detector = None
         self.video_preprocessor = VideoPreprocessor()
         self.audio_preprocessor = AudioPreprocessor()
-        self.executor = ThreadPoolExecutor(max_workers=4)
         
-        # Processing queues for different priorities
-        self.queues = {
-            1: asyncio.Queue(maxsize=100),  # Normal priority
-            2: asyncio.Queue(maxsize=50),   # High priority
-            3: asyncio.Queue(maxsize=20),   # Critical priority
+        # Blocking detector calls run on the service's own threads, so long video analyses
+        # never occupy the loop's default executor that other services and DNS lookups use
+        self._executor = ThreadPoolExecutor(max_workers=settings.DEEPFAKE_EXECUTOR_WORKERS,
+                                            thread_name_prefix="deepfake")
+        
+        # Admission limit per priority (1=normal, 2=high, 3=critical) and current depth
+        self._queue_limits = {
+            1: settings.DEEPFAKE_QUEUE_LIMIT_NORMAL,
+            2: settings.DEEPFAKE_QUEUE_LIMIT_HIGH,
+            3: settings.DEEPFAKE_QUEUE_LIMIT_CRITICAL,
         }
+        self._queued_by_priority = {priority: 0 for priority in self._queue_limits}
+        
+        # One queue for all priorities, ordered by (-priority, arrival sequence) so higher
+        # priorities go first and equal priorities stay FIFO
+        self.queue = asyncio.PriorityQueue(maxsize=sum(self._queue_limits.values()))
+        self._sequence = itertools.count()
+        
+        # Image requests are handed from the priority queue to a single batching dispatcher.
+        # Unbounded so the hand-off never parks a priority worker; images keep counting against
+        # their priority's admission limit until the dispatcher takes them, which bounds it
+        self.image_queue = asyncio.Queue()
         
-        self.processing_results = {}
+        # analysis_id -> AnalysisRecord for every known analysis
+        self.processing_results: Dict[str, AnalysisRecord] = {}
+        # IDs of completed and failed records in the order they finished; only these are
+        # evicted, so queued and in-flight analyses are never dropped
+        self._finished: Dict[str, None] = OrderedDict()
+        
+        # Running totals over processing_results, maintained by _transition
+        self._status_counts = {'queued': 0, 'processing': 0, 'completed': 0, 'failed': 0}
+        self._completed_time_sum = 0.0
+        self._completed_timed = 0
         self.is_running = False
         
+        # Analysis coroutine per supported file type
+        self._handlers = {
+            'video': self._analyze_video,
+            'image': self._analyze_image,
+            'audio': self._analyze_audio,
+        }
+        
     async def initialize(self):
         """Initialize the deepfake detection models"""
         try:
@@ -52,7 +121,27 @@ class DeepfakeService:
             
             # Load deepfake detector
             model_path = await self.model_manager.get_model_path('deepfake_detector')
-            self.detector = DeepfakeDetector(model_path)
+            # On GPU the detector runs bf16/fp16 weights in channels_last layout
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            # Loading weights and face detectors blocks; keep the loop free for health probes
+            self.detector = await self._run_blocking(DeepfakeDetector, model_path, device=device)
+            
+            # Compile to an ONNX Runtime / TensorRT engine once per process, cached on disk
+            if settings.DEEPFAKE_ORT_ENGINE and self.detector.ort_session is None:
+                try:
+                    await self._run_blocking(self.detector.load_ort_engine)
+                except Exception as e:
+                    logger.warning(f"ONNX Runtime engine unavailable, using PyTorch model: {e}")
+            
+            # Compile and autotune now rather than on the first requests
+            await self._run_blocking(self.detector.warmup)
+            
+            # Otherwise replay CUDA graphs of the eager model for fixed input shapes
+            if settings.DEEPFAKE_CUDA_GRAPHS:
+                try:
+                    await self._run_blocking(self.detector.capture_cuda_graphs)
+                except Exception as e:
+                    logger.warning(f"CUDA graph capture failed, running the model eagerly: {e}")
             
             # Start processing workers
             await self._start_workers()
@@ -64,49 +153,112 @@ class DeepfakeService:
             logger.error(f"Failed to initialize deepfake service: {e}")
             raise
     
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call on the service's executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
     async def _start_workers(self):
         """Start background workers for processing requests"""
-        # Start workers for each priority level
-        for priority in [3, 2, 1]:  # Process high priority first
-            for _ in range(2):  # 2 workers per priority level
-                asyncio.create_task(self._process_queue(priority))
-    
-    async def _process_queue(self, priority: int):
-        """Process requests from a specific priority queue"""
-        queue = self.queues[priority]
+        for _ in range(settings.DEEPFAKE_QUEUE_WORKERS):
+            asyncio.create_task(self._process_queue())
         
+        asyncio.create_task(self._dispatch_image_batches())
+    
+    async def _process_queue(self):
+        """Process requests from the priority queue, highest priority first"""
         while True:
+            # Wait for a request
+            _, _, request = await self.queue.get()
+            
             try:
-                # Wait for a request
-                request = await queue.get()
-                
                 logger.info(f"Processing deepfake analysis request", extra={
                     'analysis_id': request.analysis_id,
-                    'priority': priority,
+                    'priority': request.priority,
                     'file_type': request.file_type
                 })
                 
-                # Process the request
-                result = await self._process_deepfake_request(request)
-                
-                # Store result
-                self.processing_results[request.analysis_id] = result
+                if request.file_type == 'image':
+                    # Images are finished by the batching dispatcher
+                    self.image_queue.put_nowait(request)
+                else:
+                    # Process the request and record its outcome
+                    self._queued_by_priority[request.priority] -= 1
+                    await self._process_deepfake_request(request)
                 
+            except Exception as e:
+                logger.error(f"Error processing deepfake request: {e}")
+                self._transition(request.analysis_id, 'failed', error=str(e))
+            
+            finally:
                 # Mark task as done
-                queue.task_done()
+                self.queue.task_done()
+    
+    async def _dispatch_image_batches(self):
+        """Coalesce queued image requests into batched detector calls.
+        
+        Waits up to IMAGE_BATCH_WINDOW_MS after the first request for up to
+        IMAGE_BATCH_MAX requests, so faces from all of them share forward passes.
+        """
+        loop = asyncio.get_running_loop()
+        window = settings.IMAGE_BATCH_WINDOW_MS / 1000
+        
+        while True:
+            batch = [self._take_image(await self.image_queue.get())]
+            deadline = loop.time() + window
+            
+            while len(batch) < settings.IMAGE_BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._take_image(
+                        await asyncio.wait_for(self.image_queue.get(), remaining)))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await self._run_blocking(
+                    self.detector.analyze_images,
+                    [request.file_path for request, _ in batch]
+                )
                 
+                for (request, start_time), result in zip(batch, results):
+                    self._complete(request, result, time.time() - start_time)
+            
             except Exception as e:
-                logger.error(f"Error processing deepfake request: {e}")
-                if 'request' in locals():
-                    self.processing_results[request.analysis_id] = {
-                        'status': 'failed',
-                        'error': str(e),
-                        'timestamp': time.time()
-                    }
+                logger.error(f"Batched image analysis failed: {e}")
+                for request, start_time in batch:
+                    self._transition(request.analysis_id, 'failed', error=str(e),
+                                     processing_time=time.time() - start_time)
+            
+            finally:
+                for _ in batch:
+                    self.image_queue.task_done()
+    
+    def _take_image(self, request: DeepfakeAnalysisRequest) -> Tuple[DeepfakeAnalysisRequest, float]:
+        """Mark an image request as processing once the dispatcher picks it up"""
+        self._queued_by_priority[request.priority] -= 1
+        self._transition(request.analysis_id, 'processing')
+        return request, time.time()
     
     async def submit_analysis(self, file_path: str, file_type: str, 
                             user_id: str, priority: int = 1) -> str:
         """Submit a file for deepfake analysis"""
+        if priority not in self._queue_limits:
+            raise ValueError(f"Unsupported priority: {priority}")
+        
+        # A full priority rejects immediately instead of parking the caller
+        if self._queued_by_priority[priority] >= self._queue_limits[priority]:
+            logger.warning(f"Deepfake analysis queue full, rejecting request", extra={
+                'priority': priority,
+                'file_type': file_type
+            })
+            raise ServiceOverloaded(
+                f"Deepfake analysis queue is full for priority {priority} "
+                f"({self._queue_limits[priority]} pending)"
+            )
+        
         # Generate analysis ID
         analysis_id = self._generate_analysis_id(file_path, user_id)
         
@@ -119,16 +271,17 @@ class DeepfakeService:
             priority=priority
         )
         
-        # Add to appropriate queue
+        # Add to the queue; the sequence number breaks ties so requests are never compared.
+        # The per-priority limits sum to the queue size, so this cannot overflow
         try:
-            await self.queues[priority].put(request)
+            self.queue.put_nowait((-priority, next(self._sequence), request))
+            self._queued_by_priority[priority] += 1
             
             # Store initial status
-            self.processing_results[analysis_id] = {
-                'status': 'queued',
-                'timestamp': time.time(),
-                'file_type': file_type
-            }
+            record = AnalysisRecord(analysis_id=analysis_id, file_type=file_type)
+            self.processing_results[analysis_id] = record
+            self._count_record(record, 1)
+            self._evict_results(settings.RESULT_TTL_HOURS * 3600, settings.MAX_RETAINED_RESULTS)
             
             logger.info(f"Deepfake analysis queued", extra={
                 'analysis_id': analysis_id,
@@ -142,87 +295,101 @@ class DeepfakeService:
             logger.error(f"Failed to queue deepfake analysis: {e}")
             raise
     
-    async def _process_deepfake_request(self, request: DeepfakeAnalysisRequest) -> Dict:
-        """Process a deepfake detection request"""
+    async def _process_deepfake_request(self, request: DeepfakeAnalysisRequest):
+        """Process a deepfake detection request and record its outcome"""
         start_time = time.time()
         
         try:
             # Update status
-            self.processing_results[request.analysis_id] = {
-                'status': 'processing',
-                'timestamp': time.time(),
-                'file_type': request.file_type
-            }
+            self._transition(request.analysis_id, 'processing')
             
             # Process based on file type
-            if request.file_type == 'video':
-                result = await self._analyze_video(request.file_path)
-            elif request.file_type == 'image':
-                result = await self._analyze_image(request.file_path)
-            elif request.file_type == 'audio':
-                result = await self._analyze_audio(request.file_path)
-            else:
+            handler = self._handlers.get(request.file_type)
+            if handler is None:
                 raise ValueError(f"Unsupported file type: {request.file_type}")
+            result = await handler(request.file_path)
             
-            processing_time = time.time() - start_time
-            
-            # Prepare final result
-            final_result = {
-                'status': 'completed',
-                'analysis_id': request.analysis_id,
-                'file_type': request.file_type,
-                'result': {
-                    'is_deepfake': result.is_deepfake,
-                    'confidence': result.confidence,
-                    'overall_score': result.confidence * 100,
-                    'anomalies': result.anomalies or [],
-                    'frame_level_analysis': result.frame_level_results,
-                    'audio_analysis': result.audio_result,
-                    'processing_time': processing_time
-                },
-                'timestamp': time.time(),
-                'processing_time': processing_time
-            }
-            
-            logger.info(f"Deepfake analysis completed", extra={
-                'analysis_id': request.analysis_id,
-                'is_deepfake': result.is_deepfake,
-                'confidence': result.confidence,
-                'processing_time': processing_time
-            })
-            
-            return final_result
+            self._complete(request, result, time.time() - start_time)
             
         except Exception as e:
             logger.error(f"Deepfake analysis failed: {e}")
-            return {
-                'status': 'failed',
-                'analysis_id': request.analysis_id,
-                'error': str(e),
-                'timestamp': time.time(),
-                'processing_time': time.time() - start_time
-            }
+            self._transition(request.analysis_id, 'failed', error=str(e),
+                             processing_time=time.time() - start_time)
+    
+    def _transition(self, analysis_id: str, status: str, **fields):
+        """Move a record to a new status in place, keeping the counters and waiters in step"""
+        record = self.processing_results.get(analysis_id)
+        if record is None:
+            # Unknown ID; only finished records are ever evicted
+            return
+        
+        self._count_record(record, -1)
+        record.status = status
+        record.timestamp = time.time()
+        for name, value in fields.items():
+            setattr(record, name, value)
+        self._count_record(record, 1)
+        
+        if status in ('completed', 'failed'):
+            self._finished[analysis_id] = None
+            record.done.set()
+        
+        self._evict_results(settings.RESULT_TTL_HOURS * 3600, settings.MAX_RETAINED_RESULTS)
+    
+    def _evict_results(self, max_age_seconds: float, max_results: int) -> int:
+        """Drop finished records past their age or beyond the size bound, oldest first"""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        
+        while self._finished:
+            analysis_id = next(iter(self._finished))
+            record = self.processing_results[analysis_id]
+            if record.timestamp >= cutoff and len(self.processing_results) <= max_results:
+                break
+            
+            del self._finished[analysis_id]
+            del self.processing_results[analysis_id]
+            self._count_record(record, -1)
+            removed += 1
+        
+        return removed
+    
+    def _count_record(self, record: AnalysisRecord, sign: int):
+        """Add (sign=1) or remove (sign=-1) a record from the running totals"""
+        self._status_counts[record.status] += sign
+        
+        if record.status == 'completed' and record.processing_time is not None:
+            self._completed_time_sum += sign * record.processing_time
+            self._completed_timed += sign
+    
+    def _complete(self, request: DeepfakeAnalysisRequest, result: DeepfakeResult,
+                  processing_time: float):
+        """Record the final result of a completed analysis"""
+        self._transition(request.analysis_id, 'completed', processing_time=processing_time, result={
+            'is_deepfake': result.is_deepfake,
+            'confidence': result.confidence,
+            'overall_score': result.confidence * 100,
+            'anomalies': result.anomalies or [],
+            'frame_level_analysis': result.frame_level_results,
+            'audio_analysis': result.audio_result,
+            'processing_time': processing_time
+        })
+        
+        logger.info(f"Deepfake analysis completed", extra={
+            'analysis_id': request.analysis_id,
+            'is_deepfake': result.is_deepfake,
+            'confidence': result.confidence,
+            'processing_time': processing_time
+        })
     
     async def _analyze_video(self, file_path: str) -> DeepfakeResult:
         """Analyze video file for deepfake content"""
-        loop = asyncio.get_event_loop()
-        
-        # Run in thread pool to avoid blocking
-        return await loop.run_in_executor(
-            self.executor,
-            self.detector.analyze_video,
-            file_path
-        )
+        # Run in a worker thread to avoid blocking; decoding, OpenCV and torch release the GIL
+        return await self._run_blocking(self.detector.analyze_video, file_path)
     
     async def _analyze_image(self, file_path: str) -> DeepfakeResult:
         """Analyze image file for deepfake content"""
-        loop = asyncio.get_event_loop()
-        
-        return await loop.run_in_executor(
-            self.executor,
-            self.detector.analyze_image,
-            file_path
-        )
+        return await self._run_blocking(self.detector.analyze_image, file_path)
     
     async def _analyze_audio(self, file_path: str) -> DeepfakeResult:
         """Analyze audio file for synthetic content"""
@@ -238,12 +405,13 @@ class DeepfakeService:
     
     def get_analysis_result(self, analysis_id: str) -> Optional[Dict]:
         """Get analysis result by ID"""
-        return self.processing_results.get(analysis_id)
+        record = self.processing_results.get(analysis_id)
+        return record.to_dict() if record else None
     
     def get_analysis_status(self, analysis_id: str) -> str:
         """Get current status of analysis"""
-        result = self.processing_results.get(analysis_id)
-        return result['status'] if result else 'not_found'
+        record = self.processing_results.get(analysis_id)
+        return record.status if record else 'not_found'
     
     async def batch_analyze(self, file_paths: List[str], file_types: List[str], 
                            user_id: str, priority: int = 1) -> List[str]:
@@ -258,41 +426,37 @@ class DeepfakeService:
     
     async def wait_for_completion(self, analysis_id: str, timeout: int = 300) -> Dict:
         """Wait for analysis to complete with timeout"""
-        start_time = time.time()
+        record = self.processing_results.get(analysis_id)
+        if record is None:
+            raise AnalysisNotFound(f"Analysis {analysis_id} not found")
         
-        while time.time() - start_time < timeout:
-            result = self.get_analysis_result(analysis_id)
-            
-            if result and result['status'] in ['completed', 'failed']:
-                return result
-            
-            await asyncio.sleep(1)
+        try:
+            await asyncio.wait_for(record.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        
+        if record.done.is_set():
+            return record.to_dict()
         
         raise TimeoutError(f"Analysis {analysis_id} did not complete within {timeout} seconds")
     
     def _generate_analysis_id(self, file_path: str, user_id: str) -> str:
         """Generate unique analysis ID"""
-        content = f"{file_path}_{user_id}_{time.time()}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        return uuid.uuid4().hex[:16]
     
     def get_queue_status(self) -> Dict[int, int]:
         """Get current queue sizes"""
-        return {priority: queue.qsize() for priority, queue in self.queues.items()}
+        return dict(self._queued_by_priority)
     
     def cleanup_old_results(self, max_age_hours: int = 24):
-        """Clean up old analysis results"""
-        current_time = time.time()
-        max_age_seconds = max_age_hours * 3600
+        """Clean up old analysis results.
         
-        to_remove = []
-        for analysis_id, result in self.processing_results.items():
-            if current_time - result['timestamp'] > max_age_seconds:
-                to_remove.append(analysis_id)
+        Results already expire as new ones are recorded (RESULT_TTL_HOURS); this only
+        applies a shorter age on demand.
+        """
+        removed = self._evict_results(max_age_hours * 3600, settings.MAX_RETAINED_RESULTS)
         
-        for analysis_id in to_remove:
-            del self.processing_results[analysis_id]
-        
-        logger.info(f"Cleaned up {len(to_remove)} old analysis results")
+        logger.info(f"Cleaned up {removed} old analysis results")
     
     async def shutdown(self):
         """Shutdown the deepfake service"""
@@ -301,26 +465,30 @@ class DeepfakeService:
         self.is_running = False
         
         # Wait for queues to empty
-        for priority, queue in self.queues.items():
-            await queue.join()
+        await self.queue.join()
+        await self.image_queue.join()
+        
+        # Stop the detector's GPU inference thread
+        if self.detector is not None:
+            await self._run_blocking(self.detector.close)
         
         # Shutdown thread pool
-        self.executor.shutdown(wait=True)
+        self._executor.shutdown(wait=True)
         
         logger.info("Deepfake detection service shut down successfully")
 
     def get_performance_metrics(self) -> Dict:
         """Get performance metrics for monitoring"""
         total_processed = len(self.processing_results)
-        completed = sum(1 for r in self.processing_results.values() if r['status'] == 'completed')
-        failed = sum(1 for r in self.processing_results.values() if r['status'] == 'failed')
-        processing = sum(1 for r in self.processing_results.values() if r['status'] == 'processing')
-        queued = sum(1 for r in self.processing_results.values() if r['status'] == 'queued')
-        
-        # Calculate average processing time for completed analyses
-        completed_results = [r for r in self.processing_results.values() 
-                           if r['status'] == 'completed' and 'processing_time' in r]
-        avg_processing_time = np.mean([r['processing_time'] for r in completed_results]) if completed_results else 0
+        completed = self._status_counts['completed']
+        failed = self._status_counts['failed']
+        processing = self._status_counts['processing']
+        queued = self._status_counts['queued']
+        
+        # Average processing time of completed analyses, from the running totals
+        avg_processing_time = (
+            self._completed_time_sum / self._completed_timed if self._completed_timed else 0
+        )
         
         return {
             'total_processed': total_processed,
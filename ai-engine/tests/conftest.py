@@ -0,0 +1,52 @@
+import os
+import sys
+import types
+
+# Tests import the engine's packages the way main.py does, from the ai-engine directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _install_placeholder(module_name: str, **attrs):
+    """Register a minimal module for a helper the service imports but these tests never call"""
+    try:
+        __import__(module_name)
+    except ImportError:
+        package_name = module_name.rpartition(".")[0]
+        if package_name not in sys.modules:
+            try:
+                __import__(package_name)
+            except ImportError:
+                package = types.ModuleType(package_name)
+                package.__path__ = []
+                sys.modules[package_name] = package
+        module = types.ModuleType(module_name)
+        module.__dict__.update(attrs)
+        sys.modules[module_name] = module
+        setattr(sys.modules[package_name], module_name.rpartition(".")[2], module)
+
+
+class _Placeholder:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+_install_placeholder("utils.preprocessing", VideoPreprocessor=_Placeholder,
+                     AudioPreprocessor=_Placeholder)
+_install_placeholder("utils.model_utils", ModelManager=_Placeholder)
+
+# The rest of main.py's imports, so the application module itself can be imported
+_install_placeholder("utils.data_validation", DataValidator=_Placeholder)
+_install_placeholder("config.model_config", ModelConfig=_Placeholder)
+_install_placeholder("services.fraud_prediction_service", FraudPredictionService=_Placeholder)
+_install_placeholder("services.nlp_service", NLPService=_Placeholder)
+_install_placeholder("services.computer_vision_service", ComputerVisionService=_Placeholder)
+_install_placeholder("services.real_time_inference", RealTimeInferenceService=_Placeholder)
+
+try:
+    from fastapi import APIRouter
+except ImportError:
+    APIRouter = None
+
+if APIRouter is not None:
+    for _api_module in ("api.deepfake_api", "api.fraud_api", "api.document_api", "api.risk_api"):
+        _install_placeholder(_api_module, router=APIRouter())
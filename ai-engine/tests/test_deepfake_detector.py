@@ -0,0 +1,56 @@
+import cv2
+import numpy as np
+import pytest
+import torch
+
+from config.settings import settings
+from models.deepfake_detector import DeepfakeDetector, FaceXRayNet, _load_facexray
+
+
+def _distance(a: np.ndarray, b: np.ndarray) -> int:
+    return bin(DeepfakeDetector._frame_hash(a) ^ DeepfakeDetector._frame_hash(b)).count("1")
+
+
+@pytest.fixture
+def frame():
+    # Smooth synthetic scene, like a downscaled video frame
+    rng = np.random.default_rng(0)
+    return cv2.resize(rng.integers(0, 256, (8, 12), dtype=np.uint8), (640, 480),
+                      interpolation=cv2.INTER_CUBIC)
+
+
+def test_frame_hash_is_64_bit_and_stable(frame):
+    frame_hash = DeepfakeDetector._frame_hash(frame)
+
+    assert 0 <= frame_hash < 1 << 64
+    assert frame_hash == DeepfakeDetector._frame_hash(frame.copy())
+
+
+def test_near_duplicate_frames_fall_under_dedup_distance(frame):
+    rng = np.random.default_rng(1)
+    noisy = np.clip(frame.astype(np.int16) + rng.integers(-3, 4, frame.shape), 0, 255).astype(np.uint8)
+
+    assert _distance(frame, noisy) < settings.FRAME_DEDUP_DISTANCE
+    assert _distance(frame, cv2.add(frame, 10)) < settings.FRAME_DEDUP_DISTANCE
+
+
+def test_different_frames_exceed_dedup_distance(frame):
+    rng = np.random.default_rng(2)
+    other = rng.integers(0, 256, frame.shape, dtype=np.uint8)
+
+    assert _distance(frame, np.ascontiguousarray(frame[:, ::-1])) >= settings.FRAME_DEDUP_DISTANCE
+    assert _distance(frame, other) >= settings.FRAME_DEDUP_DISTANCE
+
+
+def test_missing_checkpoint_is_loaded_once_it_appears(tmp_path):
+    model_path = str(tmp_path / "facexray.pth")
+    untrained = _load_facexray(model_path, "cpu")
+
+    trained = FaceXRayNet(num_classes=2)
+    torch.save({'model_state_dict': trained.state_dict()}, model_path)
+    loaded = _load_facexray(model_path, "cpu")
+
+    assert loaded is not untrained
+    for name, tensor in trained.state_dict().items():
+        assert torch.equal(loaded.state_dict()[name], tensor), name
+    assert _load_facexray(model_path, "cpu") is loaded
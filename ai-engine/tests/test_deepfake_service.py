@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+from config.settings import settings
+from services.deepfake_service import AnalysisNotFound, DeepfakeService, ServiceOverloaded
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "DEEPFAKE_QUEUE_LIMIT_NORMAL", 3)
+    monkeypatch.setattr(settings, "DEEPFAKE_QUEUE_LIMIT_HIGH", 2)
+    monkeypatch.setattr(settings, "DEEPFAKE_QUEUE_LIMIT_CRITICAL", 1)
+    service = DeepfakeService(model_manager=None)
+    yield service
+    service._executor.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_unknown_priority_is_rejected_before_enqueueing(service):
+    with pytest.raises(ValueError):
+        await service.submit_analysis("a.jpg", "image", "user", priority=7)
+
+    assert service.queue.qsize() == 0
+    assert service.processing_results == {}
+
+
+@pytest.mark.asyncio
+async def test_full_priority_rejects_without_blocking_others(service):
+    for _ in range(3):
+        await service.submit_analysis("a.jpg", "image", "user", priority=1)
+
+    with pytest.raises(ServiceOverloaded):
+        await service.submit_analysis("a.jpg", "image", "user", priority=1)
+
+    # Other priorities keep their own headroom
+    await service.submit_analysis("a.jpg", "image", "user", priority=3)
+    assert service.get_queue_status() == {1: 3, 2: 0, 3: 1}
+    assert len(service.processing_results) == 4
+
+
+@pytest.mark.asyncio
+async def test_queue_serves_higher_priority_first_then_fifo(service):
+    normal_first = await service.submit_analysis("a.jpg", "image", "user", priority=1)
+    high = await service.submit_analysis("b.jpg", "image", "user", priority=2)
+    normal_second = await service.submit_analysis("c.jpg", "image", "user", priority=1)
+    critical = await service.submit_analysis("d.jpg", "image", "user", priority=3)
+
+    order = [service.queue.get_nowait()[2].analysis_id for _ in range(4)]
+    assert order == [critical, high, normal_first, normal_second]
+
+
+@pytest.mark.asyncio
+async def test_status_counters_follow_transitions(service):
+    first = await service.submit_analysis("a.jpg", "image", "user")
+    second = await service.submit_analysis("b.jpg", "image", "user")
+
+    service._transition(first, "processing")
+    service._transition(first, "completed", processing_time=2.0)
+    service._transition(second, "failed", error="boom")
+
+    metrics = service.get_performance_metrics()
+    assert metrics["completed"] == 1
+    assert metrics["failed"] == 1
+    assert metrics["processing"] == 0
+    assert metrics["queued"] == 0
+    assert metrics["avg_processing_time"] == 2.0
+    assert service.get_analysis_status(second) == "failed"
+
+
+@pytest.mark.asyncio
+async def test_size_bound_evicts_only_finished_records_oldest_first(service, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_RETAINED_RESULTS", 3)
+    ids = [await service.submit_analysis("a.jpg", "image", "user") for _ in range(3)]
+    late = await service.submit_analysis("b.jpg", "image", "user", priority=2)
+
+    # Four records over a bound of three, but nothing has finished yet
+    assert len(service.processing_results) == 4
+
+    service._transition(ids[1], "completed", processing_time=1.0)
+    assert ids[1] not in service.processing_results
+    assert service.get_analysis_status(ids[0]) == "queued"
+
+    extra = await service.submit_analysis("c.jpg", "image", "user", priority=2)
+    service._transition(ids[0], "failed", error="boom")
+    assert ids[0] not in service.processing_results
+
+    # Back within the bound, so the newest finished record stays
+    service._transition(ids[2], "completed", processing_time=1.0)
+    assert set(service.processing_results) == {ids[2], late, extra}
+    assert service.get_performance_metrics()["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_age_bound_keeps_unfinished_records(service):
+    pending = await service.submit_analysis("a.jpg", "image", "user")
+    finished = await service.submit_analysis("b.jpg", "image", "user")
+    service._transition(finished, "completed", processing_time=1.0)
+
+    for record in service.processing_results.values():
+        record.timestamp = time.time() - 3600
+
+    assert service._evict_results(60, settings.MAX_RETAINED_RESULTS) == 1
+    assert list(service.processing_results) == [pending]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion(service):
+    analysis_id = await service.submit_analysis("a.jpg", "image", "user")
+
+    with pytest.raises(AnalysisNotFound):
+        await service.wait_for_completion("missing", timeout=1)
+    with pytest.raises(TimeoutError):
+        await service.wait_for_completion(analysis_id, timeout=0.01)
+
+    asyncio.get_running_loop().call_soon(
+        lambda: service._transition(analysis_id, "completed", processing_time=1.0))
+    result = await service.wait_for_completion(analysis_id, timeout=1)
+    assert result["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_image_hand_off_keeps_workers_free_and_counts_against_admission(service):
+    images = [await service.submit_analysis("a.jpg", "image", "user") for _ in range(3)]
+    worker = asyncio.create_task(service._process_queue())
+    try:
+        while service.image_queue.qsize() < len(images):
+            await asyncio.sleep(0)
+
+        # Images wait for the (not running) dispatcher but still hold their admission slots
+        assert service.get_queue_status()[1] == 3
+        with pytest.raises(ServiceOverloaded):
+            await service.submit_analysis("b.jpg", "image", "user")
+
+        # The worker is free for a higher-priority video; with no detector it fails fast
+        video = await service.submit_analysis("c.mp4", "video", "user", priority=3)
+        result = await service.wait_for_completion(video, timeout=1)
+        assert result["status"] == "failed"
+        assert all(service.get_analysis_status(i) == "queued" for i in images)
+    finally:
+        worker.cancel()
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from models.fraud_classifier import FraudFeatureExtractor, TEXT_EMBEDDING_DIM
+
+RECORD = {
+    'text': "Guaranteed 50% returns, act now! This is a risk-free investment.",
+    'advisorData': {'sebiValid': True, 'complianceIssues': ['a', 'b'],
+                    'socialSentiment': {'negative': 0.3}},
+    'socialData': {'platform': 'TELEGRAM', 'userCredibility': 0.2,
+                   'engagement': {'likes': 90, 'views': 100}, 'postFrequency': 25,
+                   'fraudPatternScore': 0.6},
+    'financialData': {'promisedReturns': 40, 'minInvestment': 50000, 'lockInDays': 10,
+                      'feeTransparency': 0.25},
+    'technicalData': {'sslValid': False, 'domainAgeDays': 73, 'similarityToLegitSites': 0.9,
+                      'appStoreRating': 3.0, 'hasPrivacyPolicy': True, 'hasTerms': False},
+}
+
+# Values the dict-returning extractors produced for RECORD, keyed by feature name
+EXPECTED = {
+    'advisor_sebi_valid': 1.0, 'advisor_expiry_risk': 1.0, 'advisor_compliance_score': 0.4,
+    'advisor_negative_sentiment': 0.3, 'advisor_experience': 0.0,
+    'social_platform_risk': 0.8, 'social_user_credibility': 0.8, 'social_engagement_anomaly': 0.8,
+    'social_bot_probability': 0.5, 'social_fraud_pattern_match': 0.6,
+    'financial_unrealistic_returns': 0.5, 'financial_min_investment_risk': 0.5,
+    'financial_lockin_risk': 0.8, 'financial_fee_transparency': 0.75,
+    'tech_ssl_valid': 0.0, 'tech_domain_risk': 0.8, 'tech_similarity_score': 0.9,
+    'tech_app_rating_risk': 0.25, 'tech_legal_docs_missing': 0.5,
+}
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return FraudFeatureExtractor()
+
+
+def _single_extractors(extractor):
+    return {
+        'text': extractor.extract_text_features,
+        'advisorData': extractor.extract_advisor_features,
+        'socialData': extractor.extract_social_media_features,
+        'financialData': extractor.extract_financial_features,
+        'technicalData': extractor.extract_technical_features,
+    }
+
+
+def test_layout_is_consistent():
+    names = FraudFeatureExtractor.FEATURE_NAMES
+
+    assert len(set(names)) == len(names)
+    assert [FraudFeatureExtractor.FEATURE_INDEX[name] for name in names] == list(range(len(names)))
+    assert FraudFeatureExtractor.FEATURE_DIM == len(names) + TEXT_EMBEDDING_DIM
+
+    # Category slices tile the handcrafted columns in order, without gaps or overlaps
+    start = 0
+    for source, columns in FraudFeatureExtractor.CATEGORY_SLICES.values():
+        assert columns.start == start and columns.stop > columns.start
+        assert FraudFeatureExtractor.SOURCE_SLICES[source] == columns
+        start = columns.stop
+    assert start == len(names)
+
+
+def test_extractors_write_only_their_own_columns(extractor):
+    for source, extract in _single_extractors(extractor).items():
+        row = np.full(FraudFeatureExtractor.FEATURE_DIM, np.nan, dtype=np.float32)
+        extract(RECORD[source], row)
+
+        columns = FraudFeatureExtractor.SOURCE_SLICES[source]
+        outside = np.ones(row.shape, dtype=bool)
+        outside[columns] = False
+        assert not np.isnan(row[columns]).any(), source
+        assert np.isnan(row[outside]).all(), source
+
+
+def test_columns_match_the_named_features(extractor):
+    row = np.zeros(FraudFeatureExtractor.FEATURE_DIM, dtype=np.float32)
+    for source, extract in _single_extractors(extractor).items():
+        extract(RECORD[source], row)
+
+    for name, value in EXPECTED.items():
+        assert row[FraudFeatureExtractor.FEATURE_INDEX[name]] == pytest.approx(value), name
+    assert (row[FraudFeatureExtractor.SOURCE_SLICES['text']] > 0).all()
+    assert not row[len(FraudFeatureExtractor.FEATURE_NAMES):].any()
+
+
+@pytest.mark.parametrize("source, batch_method", [
+    ('advisorData', 'extract_advisor_features_batch'),
+    ('financialData', 'extract_financial_features_batch'),
+    ('technicalData', 'extract_technical_features_batch'),
+])
+def test_batch_extractors_match_single_rows(extractor, source, batch_method):
+    records = [RECORD[source], {}]
+    single = _single_extractors(extractor)[source]
+    columns = FraudFeatureExtractor.SOURCE_SLICES[source]
+
+    expected = np.stack([single(record)[columns] for record in records])
+    np.testing.assert_allclose(getattr(extractor, batch_method)(records), expected, rtol=1e-6)
@@ -0,0 +1,23 @@
+import os
+import runpy
+import sys
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def test_module_survives_running_twice_in_one_process(monkeypatch):
+    import torch
+
+    monkeypatch.delitem(sys.modules, "main", raising=False)
+
+    # A spawned uvicorn worker runs the entry script as __mp_main__, then imports "main:app"
+    runpy.run_path(MAIN_PATH, run_name="__mp_main__")
+    import main
+
+    assert main.app is not None
+    assert torch.get_num_threads() == main.THREADS_PER_CALL
@@ -0,0 +1,55 @@
+import msgspec
+import pytest
+
+from config.settings import Settings, _load_settings
+
+
+def test_defaults_without_environment(monkeypatch):
+    for field in msgspec.structs.fields(Settings):
+        monkeypatch.delenv(field.name, raising=False)
+
+    assert _load_settings() == Settings()
+
+
+def test_scalar_values_are_converted_from_strings(monkeypatch):
+    monkeypatch.setenv("PORT", "9001")
+    monkeypatch.setenv("DEBUG", "true")
+    monkeypatch.setenv("IMAGE_BATCH_WINDOW_MS", "2")
+    monkeypatch.setenv("HOST", "127.0.0.1")
+
+    loaded = _load_settings()
+
+    assert loaded.PORT == 9001
+    assert loaded.DEBUG is True
+    assert loaded.IMAGE_BATCH_WINDOW_MS == 2
+    assert loaded.HOST == "127.0.0.1"
+
+
+def test_list_values_are_json_decoded(monkeypatch):
+    monkeypatch.setenv("DEEPFAKE_INPUT_MEAN", "[0.485, 0.456, 0.406]")
+
+    assert _load_settings().DEEPFAKE_INPUT_MEAN == [0.485, 0.456, 0.406]
+
+
+def test_invalid_values_are_rejected(monkeypatch):
+    monkeypatch.setenv("PORT", "not-a-port")
+
+    with pytest.raises(msgspec.ValidationError):
+        _load_settings()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("yes", True), ("On", True), ("t", True), ("Y", True), ("1", True),
+    ("no", False), ("OFF", False), ("f", False), ("n", False), ("0", False),
+])
+def test_bool_values_accept_the_pydantic_spellings(monkeypatch, raw, expected):
+    monkeypatch.setenv("DEBUG", raw)
+
+    assert _load_settings().DEBUG is expected
+
+
+def test_unknown_bool_spelling_is_rejected(monkeypatch):
+    monkeypatch.setenv("DEBUG", "maybe")
+
+    with pytest.raises(msgspec.ValidationError):
+        _load_settings()